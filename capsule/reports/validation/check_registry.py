@@ -11,10 +11,14 @@ PROMPTS_DIR = ROOT / "prompts"
 
 ALLOWED_PREFIX = re.compile(r"^(planning|governance|quality)\.[a-z0-9_.-]+$")
 
-def eprint(*args):
-    print(*args, file=sys.stderr)
+def check_registry(out=None, err=None) -> int:
+    """Check registry/template consistency; OK goes to out, errors to err."""
+    out = out or sys.stdout
+    err = err or sys.stderr
+
+    def eprint(*args):
+        print(*args, file=err)
 
-def main():
     if not REGISTRY.exists():
         eprint(f"ERROR: registry not found at {REGISTRY}")
         return 2
@@ -59,10 +63,13 @@ def main():
         issues += len(extra)
 
     if issues == 0:
-        print("OK: registry and templates are consistent")
+        print("OK: registry and templates are consistent", file=out)
         return 0
     return 1
 
+def main():
+    return check_registry()
+
 if __name__ == "__main__":
     sys.exit(main())
 
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Machine-readable check results shared by validate_all.py and its readers.
+
+Every check yields records {check, path, severity, message, duration_ms};
+validate_all.py writes one JSON object per line to .run_tmp/results.jsonl,
+derives the gate from them, and renders the .run_tmp/*.out files and
+validation_summary.md from the same records.
+
+Severities: ok, info, skip, warn, soft, hard, fail, error. For the message
+based checks the severity is the message's leading marker (OK:, WARN:, ...);
+message text is kept verbatim so rendered output reads as before.
+"""
+from __future__ import annotations
+import json
+import re
+from pathlib import Path
+
+from x_list_unknowns import format_blocks
+
+SEVERITY_RE = re.compile(r"(OK|INFO|SKIP|WARN|SOFT|HARD|FAIL|ERROR)\b")
+
+HEADER_LINES = {
+    "ok": "OK: {path} header is valid",
+    "skip": "SKIP skeleton: {path}",
+    "warn": "WARN placeholder feature_id in {path}",
+}
+
+
+def severity_of(message: str) -> str:
+    m = SEVERITY_RE.match(message)
+    return m.group(1).lower() if m else "info"
+
+
+def record(check: str, path, severity: str, message: str, duration_ms: float = 0.0) -> dict:
+    return {
+        "check": check,
+        "path": None if path is None else str(path),
+        "severity": severity,
+        "message": message,
+        "duration_ms": round(duration_ms, 3),
+    }
+
+
+def message_records(check: str, msgs, duration_ms: float = 0.0) -> list[dict]:
+    """Records for (path, message) pairs as returned by the x_check_* modules."""
+    return [record(check, path, severity_of(msg), msg, duration_ms) for path, msg in msgs]
+
+
+def render(check: str, records: list[dict]) -> list[str]:
+    """Text lines for one check, as its .run_tmp/<check>.out file shows them."""
+    if check == "headers":
+        # Invalid documents are reported on stderr only
+        return [HEADER_LINES[r["severity"]].format(path=r["path"]) for r in records if r["severity"] in HEADER_LINES]
+    if check == "registry":
+        # Errors go to stderr, like check_registry.py prints them
+        return [r["message"] for r in records if r["severity"] != "error"]
+    if check == "unknowns":
+        found: list[tuple[str, list[str]]] = []
+        for r in records:
+            if not found or found[-1][0] != r["path"]:
+                found.append((r["path"], []))
+            found[-1][1].append(r["message"])
+        return format_blocks(found)
+    return [f"{r['path']}: {r['message']}" if r["path"] else r["message"] for r in records]
+
+
+def write_results(path: Path, records: list[dict]) -> None:
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8")
+
+
+def read_results(path: Path) -> list[dict]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return []
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
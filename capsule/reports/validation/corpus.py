@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Single-pass view of the capsule/ and features/ trees shared by the checks.
+
+Corpus walks each root once and Document reads each file at most once; the
+header, the section/table index (md_index.py) and parsed JSON are derived
+lazily from that single read. Files over STREAM_BYTES can instead be read in
+pieces (Document.pieces), which is how the size and leakage check keeps
+memory flat on pasted multi-MB logs. Read and parse errors are cached and
+re-raised on access, so every check still reports them the way it did when
+it read files itself.
+Per-unit parsing (schema, UNKNOWN rows, mapping and test tables) is in
+feature_capsule.py, reached through Corpus.capsule().
+When given a result_cache.UnitCache, Corpus.memo() reuses check results whose
+input files are unchanged; without one it simply computes them.
+
+With FEATURE_ID set, a default Corpus covers only features/<FEATURE_ID>, so a
+per-step run does not depend on sibling features; VALIDATION_FULL_TREE=1
+restores the capsule/ and features/ scan.
+"""
+from __future__ import annotations
+import fnmatch
+import io
+import json
+import os
+from pathlib import Path
+from typing import Iterator
+
+from md_index import MarkdownIndex
+
+ROOT = Path(__file__).resolve().parents[3]
+BASES = ("capsule", "features")
+# Header checks look no further than this into a document
+HEADER_LINES = 50
+HEADER_BYTES = 16 * 1024
+HEADER_CHUNK = 4096
+# Larger files are hashed and scanned in pieces of TEXT_CHUNK characters
+# instead of being loaded whole (Document.pieces)
+STREAM_BYTES = 1 << 20
+TEXT_CHUNK = 256 * 1024
+
+
+def decode_text(data: bytes) -> str:
+    """UTF-8 with universal newlines, as Path.read_text() would give."""
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def header_done(lines: list[str]) -> bool:
+    """Whether `lines` cover what the header checks read.
+
+    That is the block up to its first blank line after a `key:` line
+    (parse_header_lines) and the first five non-blank lines (the order check
+    in check_document_headers.py).
+    """
+    seen = ended = False
+    nonblank = 0
+    for line in lines:
+        if line.strip():
+            nonblank += 1
+            seen = seen or ":" in line
+        elif seen:
+            ended = True
+        if ended and nonblank >= 5:
+            return True
+    return len(lines) >= HEADER_LINES
+
+
+def read_head(f, max_lines: int = HEADER_LINES, max_bytes: int = HEADER_BYTES, header: bool = True) -> list[str]:
+    """Leading lines of a binary stream, read in small chunks.
+
+    Stops once header_done() holds (with header=False: once max_lines lines
+    are in), at EOF, or after max_bytes; a line cut off by the budget is
+    dropped. Only the bytes read are decoded, so a header check costs the
+    same for a 2 KB document and a 50 MB one.
+    """
+    buf = b""
+    while True:
+        chunk = f.read(min(HEADER_CHUNK, max_bytes - len(buf)))
+        buf += chunk
+        eof = not chunk
+        end = len(buf) if eof else buf.rfind(b"\n") + 1
+        lines = decode_text(buf[:end]).splitlines()[:max_lines]
+        if eof or len(buf) >= max_bytes or (header_done(lines) if header else len(lines) >= max_lines):
+            return lines
+
+
+def parse_header_lines(lines, max_lines: int = HEADER_LINES) -> dict:
+    """Collect `key: value` lines up to the first blank line after the header."""
+    header = {}
+    for i, line in enumerate(lines):
+        if i >= max_lines:
+            break
+        if not line.strip():
+            # stop at first blank line after collecting some fields
+            if header:
+                break
+            continue
+        if ":" in line:
+            k, v = line.split(":", 1)
+            header[k.strip()] = v.strip()
+    return header
+
+
+def scope_bases(feature_id: str | None = None, full_tree: bool | None = None) -> tuple[str, ...]:
+    """Bases to scan: features/<feature_id> when one is given, else every root.
+
+    Both arguments default to the FEATURE_ID and VALIDATION_FULL_TREE variables.
+    """
+    if feature_id is None:
+        feature_id = os.environ.get("FEATURE_ID", "")
+    if full_tree is None:
+        full_tree = os.environ.get("VALIDATION_FULL_TREE", "0") == "1"
+    if not feature_id or full_tree:
+        return BASES
+    return (f"features/{feature_id}",)
+
+
+class Document:
+    """One file read once; derived views are computed on first access.
+
+    `stats` ({"files": n, "bytes": n}) counts the read, when given.
+    """
+
+    def __init__(self, path: Path, stats: dict | None = None):
+        self.path = path
+        self._stats = stats
+        self._data = None
+        self._text = None
+        self._error = None
+        self._lines = None
+        self._head = None
+        self._header = None
+        self._index = None
+        self._json = None
+        self._json_error = None
+
+    @property
+    def data(self) -> bytes:
+        """Raw bytes, also used to hash the file for the result cache."""
+        if self._data is None and self._error is None:
+            try:
+                self._data = self.path.read_bytes()
+                if self._stats is not None:
+                    self._stats["files"] += 1
+                    self._stats["bytes"] += len(self._data)
+            except Exception as e:
+                self._error = e
+        if self._error is not None:
+            raise self._error
+        return self._data
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            data = self.data
+            try:
+                self._text = decode_text(data)
+            except Exception as e:
+                self._error = e
+                raise
+        return self._text
+
+    @property
+    def streamed(self) -> bool:
+        """Whether the file is over STREAM_BYTES and not loaded already."""
+        if self._data is not None or self._error is not None:
+            return False
+        try:
+            return os.stat(self.path).st_size > STREAM_BYTES
+        except OSError:
+            return False
+
+    def pieces(self, size: int = TEXT_CHUNK) -> Iterator[str]:
+        """The text in order: whole when small or loaded, else decoded from
+        disk `size` characters at a time and never held (or cached) whole."""
+        if not self.streamed:
+            yield self.text
+            return
+        # Universal newlines, as decode_text()
+        with open(self.path, encoding="utf-8", newline=None) as f:
+            while True:
+                piece = f.read(size)
+                if not piece:
+                    break
+                yield piece
+            if self._stats is not None:
+                self._stats["files"] += 1
+                self._stats["bytes"] += f.buffer.tell()
+
+    @property
+    def lines(self) -> list[str]:
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    @property
+    def head(self) -> list[str]:
+        """Leading lines up to the end of the header block (see read_head).
+
+        Read on its own when the whole file has not been loaded, so header
+        checks never pull in the body.
+        """
+        if self._head is None:
+            if self._data is not None or self._error is not None:
+                self._head = read_head(io.BytesIO(self.data))
+            else:
+                try:
+                    f = open(self.path, "rb")
+                except OSError as e:
+                    self._error = e
+                    raise
+                with f:
+                    self._head = read_head(f)
+                    if self._stats is not None:
+                        self._stats["files"] += 1
+                        self._stats["bytes"] += f.tell()
+        return self._head
+
+    @property
+    def header(self) -> dict:
+        if self._header is None:
+            self._header = parse_header_lines(self.head)
+        return self._header
+
+    @property
+    def index(self) -> MarkdownIndex:
+        """Sections and tables, indexed in one pass on first access."""
+        if self._index is None:
+            self._index = MarkdownIndex.from_text(self.text)
+        return self._index
+
+    @property
+    def sections(self) -> dict[str, list[str]]:
+        """`## ` heading title -> body lines; the first heading of a title wins."""
+        return {title: s.lines for title, s in self.index.sections.items()}
+
+    def table(self, title: str) -> list[list[str]]:
+        """Pipe-table rows (stripped cells) found in a section."""
+        section = self.index.section(title)
+        if section is None:
+            return []
+        return [[c.strip() for c in ln.split("|")] for ln in section.table_lines()]
+
+    @property
+    def json(self):
+        if self._json is None and self._json_error is None:
+            try:
+                self._json = json.loads(self.text)
+            except Exception as e:
+                self._json_error = e
+        if self._json_error is not None:
+            raise self._json_error
+        return self._json
+
+
+class Corpus:
+    """Directory index of the validated roots plus a cache of Documents.
+
+    `bases` are paths relative to root (default: scope_bases()); a single unit
+    such as "features/<id>" can be scanned on its own and is then the only
+    entry units() reports for its root.
+    """
+
+    def __init__(self, root: Path = ROOT, bases=None, cache=None):
+        self.root = Path(root)
+        self.cache = cache
+        self._prefix = len(str(self.root)) + 1
+        self._children: dict[Path, list[Path]] = {}
+        self._files: set[Path] = set()
+        self._docs: dict[Path, Document] = {}
+        self._capsules: dict = {}
+        self.stats = {"files": 0, "bytes": 0}
+        for base in scope_bases() if bases is None else bases:
+            top = self.root / base
+            self._scan(top)
+            if self.exists(top) and top.parent != self.root and top.parent not in self._files:
+                siblings = self._children.setdefault(top.parent, [])
+                if top not in siblings:
+                    siblings.append(top)
+
+    def _scan(self, top: Path) -> None:
+        if top.is_file():
+            self._files.add(top)
+            return
+        if not top.is_dir():
+            return
+        for dirpath, dirnames, filenames in os.walk(top):
+            d = Path(dirpath)
+            self._children[d] = [d / n for n in dirnames + filenames]
+            self._files.update(d / n for n in filenames)
+
+    def exists(self, path: Path) -> bool:
+        return path in self._files or path in self._children
+
+    def is_dir(self, path: Path) -> bool:
+        return path in self._children
+
+    def subdirs(self, base: Path) -> list[Path]:
+        """Immediate subdirectories, like sorted(base.glob('*')) filtered to dirs."""
+        return sorted(p for p in self._children.get(base, []) if p in self._children)
+
+    def units(self, base: Path) -> list[Path]:
+        """Top-level entries (dirs and files) of a root, sorted; the unit of parallel work."""
+        return sorted(self._children.get(base, []))
+
+    def files(self, under: Path, pattern: str = "*.md") -> list[Path]:
+        """Files below `under` matching `pattern`, like sorted(under.rglob(pattern)).
+
+        A file path yields itself when it matches, so a unit may be a loose file.
+        """
+        if under in self._files:
+            return [under] if fnmatch.fnmatchcase(under.name, pattern) else []
+        found = []
+        stack = [under] if under in self._children else []
+        while stack:
+            for p in self._children[stack.pop()]:
+                if p in self._children:
+                    stack.append(p)
+                elif fnmatch.fnmatchcase(p.name, pattern):
+                    found.append(p)
+        return sorted(found)
+
+    def doc(self, path: Path) -> Document:
+        doc = self._docs.get(path)
+        if doc is None:
+            doc = self._docs[path] = Document(path, self.stats)
+        return doc
+
+    def capsule(self, base: Path):
+        """The unit's FeatureCapsule (feature_capsule.py), one per unit and corpus."""
+        capsule = self._capsules.get(base)
+        if capsule is None:
+            from feature_capsule import FeatureCapsule  # it builds on this module
+            capsule = self._capsules[base] = FeatureCapsule(base, self)
+        return capsule
+
+    def _rel(self, path: Path) -> str:
+        # Cheaper than relative_to(); every path here is built from root
+        return str(path)[self._prefix:].replace(os.sep, "/")
+
+    def memo(self, check: str, version: str, subject: Path, inputs, compute):
+        """compute(), or its cached value while every input file is unchanged.
+
+        The value must be JSON-serialisable; tuples come back as lists.
+        """
+        if self.cache is None:
+            return compute()
+        digests = {}
+        try:
+            for p in inputs:
+                rel = self._rel(p)
+                read = None
+                if p in self._files:
+                    # Large files are hashed from disk rather than loaded
+                    read = lambda p=p: None if self.doc(p).streamed else self.doc(p).data
+                digests[rel] = self.cache.digest(rel, p, read)
+        except Exception:
+            # Unreadable input: let the check report it, uncached
+            return compute()
+        key = f"{check}@{version}:{self._rel(subject)}"
+        return self.cache.memo(key, digests, compute)
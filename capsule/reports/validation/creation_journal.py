@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Append-only journal behind features/<fid>/reports/creation_run.md.
+
+Each validator run used to re-read the whole log to find the next step
+number, rewrite it to refresh the `updated:` date and test every UNKNOWN
+row against the full text, so a run cost grew with the log and a
+long-lived feature's history went quadratic. A run now appends records to
+reports/creation_run.jsonl, one JSON object per line:
+
+  {"op": "base", "date": D, "text": T}            log text the rest builds on
+  {"op": "step", "date": D, "step": N, "doc": ..., "gate": ..., "decisions": ..., "links": ...}
+  {"op": "unknown", "sha": H, "row": R}
+  {"op": "implementable", "date": D}
+
+creation_run.md is their rendering: the last base text, then one line per
+step and UNKNOWN record (and the IMPLEMENTABLE block), with each
+`updated:` line among the first 12 set to the last base or step date (a
+base imported by mark_implementable() has none) --
+the format x_check_creation_run.py validates and earlier runs wrote. A run
+appends its lines to the markdown and patches the date in place rather
+than rendering it again.
+
+The last step number and the hashes of the UNKNOWN rows (and of the base
+text's lines) are kept in .run_tmp/cache/creation/<fid>.json, so the next
+step is a lookup and an UNKNOWN row is de-duplicated by hash: it is added
+unless the same line is already there (reported step rows and table
+headers are never added). That state is
+rebuilt by replaying the journal when it is missing or the journal has
+changed. When creation_run.md no longer matches the journal (edited by
+hand, or written before the journal existed) its text becomes a new base
+record; a deleted creation_run.md is rendered again from the journal.
+
+Both entry points hold an advisory lock on the journal (run_files.locked())
+for the whole read-append cycle, and a full rewrite of creation_run.md is
+atomic, so runs for one feature can overlap without duplicating steps.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from result_cache import CACHE_DIR, RACY_SECONDS, file_sha256, source_version
+from run_files import atomic_write, locked
+
+LOG_NAME = "creation_run.md"
+JOURNAL_NAME = "creation_run.jsonl"
+STATE_DIR = CACHE_DIR / "creation"
+# Cached state is only as good as the code that derived it
+VERSION = source_version(Path(__file__))
+HEADER_LINES = 12
+
+UNKNOWN_TABLE_HEADER = "ID | Question | Possible Effects | Recommended Actions | Next Step | Impact (High/Moderate/Low)"
+STEP_TABLE_HEADER = "Step | Doc | Gate | Key decisions | Links"
+STEP_RE = re.compile(r"^[0-9]+ \|")
+
+
+def log_header(feature_id: str, today: str) -> str:
+    return (
+        f"feature_id: {feature_id}\n"
+        "doc_type: governance.creation_run\n"
+        f"schema_ref: urn:automatr:schema:capsule:{feature_id}:governance.creation_run:v1@0.1.0\n"
+        "version: 0.1.0\n"
+        f"updated: {today}\n"
+        "\n"
+    )
+
+
+def skeleton(feature_id: str, today: str) -> str:
+    """A new, empty log."""
+    return (
+        log_header(feature_id, today)
+        + f"{STEP_TABLE_HEADER}\n--- | --- | --- | --- | ---\n\n"
+        + f"## UNKNOWN Summary\n{UNKNOWN_TABLE_HEADER}\n"
+    )
+
+
+def set_date(text: str, today: str) -> str:
+    lines = text.split("\n")
+    for i in range(min(HEADER_LINES, len(lines))):
+        if lines[i].startswith("updated: "):
+            lines[i] = f"updated: {today}"
+    return "\n".join(lines)
+
+
+def prepare(text: str, feature_id: str, today: str) -> str:
+    """An existing log with its header, date, step table and UNKNOWN Summary ensured."""
+    if not text.startswith("feature_id:"):
+        text = log_header(feature_id, today) + text
+    else:
+        text = set_date(text, today)
+    if not re.search(rf"^{re.escape(STEP_TABLE_HEADER)}", text, re.M):
+        text += f"\n{STEP_TABLE_HEADER}\n--- | --- | --- | --- | ---\n"
+    if not re.search(r"^## UNKNOWN Summary", text, re.M):
+        text += f"\n## UNKNOWN Summary\n{UNKNOWN_TABLE_HEADER}\n"
+    return text
+
+
+def next_step(text: str) -> int:
+    last = None
+    for line in text.splitlines():
+        if STEP_RE.match(line):
+            last = line.split("|", 1)[0].strip()
+    return int(last) + 1 if last else 1
+
+
+def reported(row: str) -> bool:
+    """Whether an UNKNOWN row reported by the checks belongs in the log.
+
+    Step rows and table headers (a copy of another log, say) are left out:
+    the log has its own, the hashes cover only base and UNKNOWN lines, and
+    an extra step row would also throw off next_step().
+    """
+    if not row or row.startswith("File:") or STEP_RE.match(row):
+        return False
+    return not row.startswith("ID |") and row != STEP_TABLE_HEADER
+
+
+def line_hash(line: str) -> str:
+    return hashlib.sha256(line.encode("utf-8")).hexdigest()[:16]
+
+
+def record_lines(rec: dict) -> list[str]:
+    """The markdown lines a journal record renders to."""
+    op = rec.get("op")
+    if op == "step":
+        return [f"{rec['step']} | {rec['doc']} | {rec['gate']} | {rec['decisions']} | {rec['links']}"]
+    if op == "unknown":
+        return [rec["row"]]
+    if op == "implementable":
+        return ["", "## IMPLEMENTABLE", "Status: Ready for code-generation", f"Date: {rec['date']}"]
+    return []
+
+
+class LogState:
+    """What a run needs to know about the log without reading it."""
+
+    __slots__ = ("last", "date", "hashes", "implementable")
+
+    def __init__(self, text: str, date: str | None):
+        self.last = next_step(text) - 1
+        self.date = date
+        self.hashes = {line_hash(ln) for ln in text.split("\n")}
+        self.implementable = re.search(r"^## IMPLEMENTABLE", text, re.M) is not None
+
+    def absorb(self, rec: dict) -> list[str]:
+        """Apply one appended record; returns its lines."""
+        lines = record_lines(rec)
+        for line in lines:
+            if STEP_RE.match(line):
+                self.last = int(line.split("|", 1)[0].strip())
+        if rec.get("op") == "unknown":
+            self.hashes.add(rec["sha"])
+        elif rec.get("op") == "implementable":
+            self.implementable = True
+        elif rec.get("op") == "step":
+            self.date = rec["date"]
+        return lines
+
+
+def read_records(journal: Path):
+    try:
+        f = journal.open(encoding="utf-8")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn by an interrupted append
+            if isinstance(rec, dict):
+                yield rec
+
+
+def replay(journal: Path) -> tuple[str | None, LogState | None]:
+    """The rendered log and its state; (None, None) before the first base."""
+    parts: list[str] = []
+    state = None
+    for rec in read_records(journal):
+        if rec.get("op") == "base":
+            parts = [rec["text"]]
+            state = LogState(rec["text"], rec["date"])
+        elif state is not None:
+            parts.extend(f"{ln}\n" for ln in state.absorb(rec))
+    if state is None:
+        return None, None
+    text = "".join(parts)
+    return (set_date(text, state.date) if state.date else text), state
+
+
+def patch_date(path: Path, today: str) -> bool:
+    """set_date() in place; False when a line would change length."""
+    new = f"updated: {today}".encode()
+    with path.open("r+b") as f:
+        pos = 0
+        for _ in range(HEADER_LINES):
+            line = f.readline()
+            if not line:
+                break
+            body = line[:-1] if line.endswith(b"\n") else line
+            if body.startswith(b"updated: ") and body != new:
+                if len(body) != len(new):
+                    return False
+                f.seek(pos)
+                f.write(new)
+                f.seek(pos + len(line))
+            pos += len(line)
+    return True
+
+
+class CreationJournal:
+    def __init__(self, report_dir: Path, feature_id: str):
+        self.feature_id = feature_id
+        self.log_file = report_dir / LOG_NAME
+        self.journal = report_dir / JOURNAL_NAME
+        self.state_file = STATE_DIR / f"{feature_id}.json"
+
+    def log_step(self, today: str, gate: str, unknown_rows: list[str], step: str = "",
+                 doc: str = "(all)", decisions: str = "-", links: str = "-") -> None:
+        """Append a step row and the UNKNOWN rows not already in the log.
+
+        The journal stays locked from reading the last step to appending the
+        next, so overlapping runs number their steps one after another."""
+        with locked(self.journal) as journal:
+            state, text, records = self._sync(today)
+            rec = {"op": "step", "date": today, "step": step or str(state.last + 1),
+                   "doc": doc, "gate": gate, "decisions": decisions, "links": links}
+            records.append(rec)
+            lines = state.absorb(rec)
+            for row in filter(reported, unknown_rows):
+                sha = line_hash(row)
+                if sha not in state.hashes:
+                    rec = {"op": "unknown", "sha": sha, "row": row}
+                    records.append(rec)
+                    lines.extend(state.absorb(rec))
+            self._commit(journal, state, text, records, lines, patch=True)
+
+    def mark_implementable(self, today: str) -> None:
+        """Append the IMPLEMENTABLE block unless the log already has one."""
+        if not self.log_file.exists():
+            return
+        with locked(self.journal) as journal:
+            state, text, records = self._sync(today, step=False)
+            if state.implementable:
+                if records:
+                    self._commit(journal, state, text, records, [], patch=False)
+                return
+            rec = {"op": "implementable", "date": today}
+            records.append(rec)
+            self._commit(journal, state, text, records, state.absorb(rec), patch=False)
+
+    def render(self) -> str | None:
+        return replay(self.journal)[0]
+
+    def _sync(self, today: str, step: bool = True) -> tuple[LogState, str | None, list[dict]]:
+        """State matching creation_run.md, the rendered text when the markdown
+        must be written whole (else None), and the records the run starts with.
+
+        A markdown that differs from the journal becomes a base record; a step
+        first ensures its header, date and tables as prepare() does."""
+        cached = self._load_state()
+        if cached is not None:
+            (state, md), text = cached, None
+            # A base without a date was never prepare()d; a step must do that first
+            if self._unchanged(md) and (state.date or not step):
+                return state, None, []
+        else:
+            text, state = replay(self.journal)
+        if state is not None and text is None:
+            text = replay(self.journal)[0]
+        ready = state is not None and (state.date or not step)
+        if self.log_file.exists():
+            current = self.log_file.read_text(encoding="utf-8")
+            if ready and current == text:
+                return state, None, []
+            if not step:
+                return LogState(current, None), current, [{"op": "base", "date": None, "text": current}]
+            base = prepare(current, self.feature_id, today)
+        elif ready:
+            return state, text, []  # deleted: render it again
+        elif state is not None:
+            base = prepare(text, self.feature_id, today)
+        else:
+            base = skeleton(self.feature_id, today)
+        return LogState(base, today), base, [{"op": "base", "date": today, "text": base}]
+
+    def _commit(self, journal, state: LogState, text: str | None, records: list[dict],
+                lines: list[str], patch: bool) -> None:
+        """Append `records` to the open, locked journal and their `lines` to the markdown."""
+        journal.seek(0, os.SEEK_END)
+        if journal.tell():
+            journal.seek(journal.tell() - 1)
+            if journal.read(1) != b"\n":
+                journal.write(b"\n")
+        journal.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8"))
+        journal.flush()
+        added = "".join(f"{ln}\n" for ln in lines)
+        if text is None:
+            with self.log_file.open("a", encoding="utf-8") as f:
+                f.write(added)
+            if patch and not patch_date(self.log_file, state.date):
+                text = replay(self.journal)[0]
+        else:
+            text = text + added
+            if state.date:
+                text = set_date(text, state.date)
+        if text is not None:
+            atomic_write(self.log_file, text)
+        self._save_state(state)
+
+    def _unchanged(self, rec: dict | None) -> bool:
+        try:
+            st = self.log_file.stat()
+        except OSError:
+            return False
+        if not rec or st.st_size != rec["size"]:
+            return False
+        if rec["mtime_ns"] is not None and st.st_mtime_ns == rec["mtime_ns"]:
+            return True
+        return rec["sha256"] is not None and file_sha256(self.log_file) == rec["sha256"]
+
+    def _load_state(self) -> tuple[LogState, dict] | None:
+        try:
+            data = json.loads(self.state_file.read_text(encoding="utf-8"))
+            st = self.journal.stat()
+            if data["version"] != VERSION or data["journal"] != [str(self.journal), st.st_size, st.st_mtime_ns]:
+                return None
+            state = LogState.__new__(LogState)
+            state.last, state.date = data["last"], data["date"]
+            state.hashes, state.implementable = set(data["hashes"]), data["implementable"]
+            return state, data["md"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_state(self, state: LogState) -> None:
+        try:
+            jst, st = self.journal.stat(), self.log_file.stat()
+            # Same-tick edits can keep size and mtime (see result_cache.py)
+            racy = time.time() - st.st_mtime_ns / 1e9 < RACY_SECONDS
+            data = {
+                "version": VERSION,
+                "journal": [str(self.journal), jst.st_size, jst.st_mtime_ns],
+                "md": {"size": st.st_size, "mtime_ns": None if racy else st.st_mtime_ns,
+                       "sha256": file_sha256(self.log_file) if racy else None},
+                "last": state.last,
+                "date": state.date,
+                "implementable": state.implementable,
+                "hashes": list(state.hashes),
+            }
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_name(f"{self.state_file.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass  # replayed from the journal next time
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Lazy object model of one feature capsule (or any capsule/ or features/ unit),
+shared by the x_check_* scripts and the packager.
+
+FeatureCapsule reads through a Corpus, so each file is read once, and each
+property is computed on first access and kept: the schema is parsed once for
+the required keys, the concurrency targets and the packager's manifest; the
+header, UNKNOWN Summary, checklist mapping and manual-test parsers live here
+instead of in each check. Corpus.capsule() hands every check of a unit the
+same instance. Rows are small __slots__ records.
+
+Properties raise what the underlying Document raises (unreadable file, bad
+JSON); such errors are not memoised, but the Document caches them, so
+retrying costs nothing.
+"""
+from __future__ import annotations
+import re
+from pathlib import Path
+
+from corpus import ROOT, Corpus, Document
+from md_index import unknown_rows
+
+TESTS_HEADER_RE = re.compile(r"^\s*ID\s*\|\s*Test Name\s*\|\s*Inputs\s*\|\s*Expected Result\s*\|\s*Linked Schema Key\s*\|\s*Status\s*$", re.I)
+SEPARATOR_CELL_RE = re.compile(r":?-+:?")
+HEADER_FIELDS = ("feature_id", "doc_type", "schema_ref", "version", "updated")
+
+
+class lazy:
+    """Read-only property computed once per instance and kept in its `_memo`."""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.name = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return obj._memo[self.name]
+        except KeyError:
+            value = obj._memo[self.name] = self.fn(obj)
+            return value
+
+
+class UnknownRow:
+    """One UNKNOWN Summary row: `text` as stripped in the document, `cells` non-empty."""
+
+    __slots__ = ("path", "text", "cells")
+
+    def __init__(self, path: Path, text: str):
+        self.path = path
+        self.text = text
+        self.cells = [c.strip() for c in text.split("|") if c.strip()]
+
+    @property
+    def impact(self) -> str:
+        return self.cells[-1] if self.cells else ""
+
+    @property
+    def well_formed(self) -> bool:
+        return len(self.cells) >= 6
+
+    def __repr__(self) -> str:
+        return f"UnknownRow({str(self.path)!r}, {self.text!r})"
+
+
+class ManualTest:
+    """One row of the Tests table in manual_tests.md."""
+
+    __slots__ = ("id", "name", "inputs", "expected", "schema_key", "status")
+
+    def __init__(self, cells: list[str]):
+        self.id, self.name, self.inputs, self.expected, self.schema_key, self.status = cells[:6]
+
+    def __repr__(self) -> str:
+        return f"ManualTest({self.id!r}, {self.schema_key!r})"
+
+
+def is_mapping_header(line: str) -> bool:
+    """`Checklist ... Schema ...`, as a table header (outer pipes or not) or a section title."""
+    low = line.strip().strip("|").strip().lower()
+    return low.startswith("checklist") and "schema" in low
+
+
+def parse_tests_table(doc: Document) -> list[ManualTest]:
+    """Rows after the `ID | Test Name | ... | Status` header of the first `## Tests...` section."""
+    section = doc.index.find(lambda title: title.lower().startswith("tests"))
+    if section is None:
+        return []
+    header_seen = False
+    rows = []
+    for ln in section.table_lines():
+        if not header_seen:
+            header_seen = bool(TESTS_HEADER_RE.match(ln.strip()))
+            continue
+        if not ln.strip().startswith("|-"):
+            # Expect 6 columns; be tolerant to leading/ending pipes
+            parts = [p for p in (p.strip() for p in ln.split("|")) if p != ""]
+            if len(parts) >= 6:
+                rows.append(ManualTest(parts))
+    return rows
+
+
+class FeatureCapsule:
+    """One unit directory of the corpus, parsed lazily and at most once."""
+
+    __slots__ = ("base", "corpus", "_memo")
+
+    def __init__(self, base: Path, corpus: Corpus | None = None):
+        self.base = base
+        self.corpus = corpus or Corpus(bases=(base.relative_to(ROOT).as_posix(),))
+        self._memo: dict = {}
+
+    def path(self, rel: str) -> Path:
+        return self.base / rel
+
+    def exists(self, rel: str) -> bool:
+        return self.corpus.exists(self.base / rel)
+
+    def doc(self, rel: str) -> Document:
+        return self.corpus.doc(self.base / rel)
+
+    def text(self, rel: str) -> str:
+        """A document's text; invalid UTF-8 is replaced, as read_text(errors="replace")."""
+        doc = self.doc(rel)
+        try:
+            return doc.text
+        except UnicodeDecodeError:
+            return doc.data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+    @lazy
+    def docs(self) -> list[Path]:
+        """Every *.md below the unit, sorted."""
+        return self.corpus.files(self.base)
+
+    @lazy
+    def top_docs(self) -> list[Path]:
+        """*.md directly in the unit and in its reports/, sorted: what the packager gates."""
+        return [p for p in self.docs if p.parent in (self.base, self.base / "reports")]
+
+    def header(self, path: Path) -> dict:
+        """`key: value` fields of a document's header block (see corpus.parse_header_lines)."""
+        return self.corpus.doc(path).header
+
+    @lazy
+    def schema(self):
+        return self.doc("output_contract.schema.json").json
+
+    @lazy
+    def required_keys(self) -> list:
+        return self.schema.get("required") or []
+
+    @lazy
+    def concurrency_targets(self):
+        return self.schema.get("concurrency_targets")
+
+    @lazy
+    def mapping_keys(self) -> set[str]:
+        """Schema keys named in intent_card.md's checklist ↔ schema mapping table.
+
+        The table is the first one with a `Checklist ... Schema ...` header
+        line, else the first table of a `## Checklist ... Schema` section
+        (below its header line). The key is the second non-empty cell of each
+        row, backticks stripped, with or without outer pipes; separator rows
+        are skipped.
+        """
+        index = self.doc("intent_card.md").index
+        rows = None
+        for table in index.tables():
+            start = next((i for i, ln in enumerate(table.lines) if is_mapping_header(ln)), None)
+            if start is not None:
+                rows = table.lines[start + 1:]
+                break
+        if rows is None:
+            section = index.find(is_mapping_header)
+            rows = section.tables[0].rows if section is not None and section.tables else []
+        mapped = set()
+        for ln in rows:
+            cells = [c.strip().strip("`") for c in ln.split("|") if c.strip().strip("`")]
+            if len(cells) >= 2 and not all(SEPARATOR_CELL_RE.fullmatch(c) for c in cells):
+                mapped.add(cells[1])
+        return mapped
+
+    @lazy
+    def unknown_rows(self) -> list[UnknownRow]:
+        """UNKNOWN Summary rows of every document, in document order."""
+        return [UnknownRow(p, row) for p in self.docs for row in unknown_rows(self.corpus.doc(p).index)]
+
+    @lazy
+    def manual_tests(self) -> list[ManualTest]:
+        return parse_tests_table(self.doc("manual_tests.md"))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Latest validation result per feature, for tools that gate on it (the
+packager, tools/final_bundle/verify_and_package.py).
+
+A run that validates a feature (FEATURE_ID or batch mode) stores its gate,
+stop reason and the worst severity per check in .run_tmp/features/<fid>.json.
+Severities come from the feature's own records: those on features/<fid>/
+or a file under it, and run-wide ones without a path (the registry's).
+The record holds the SHA-256 of every file under features/<fid>/ and
+prompts/ (the registry check reads the registry and the templates it
+lists). Hashes are taken when the run ends, after its own creation-log
+step and validation_summary.md, so the run's outputs do not make its
+result stale.
+load_fresh() returns the record only while those files and the validator's
+sources are unchanged; hashes reuse the feature's result cache entries
+while size and mtime match.
+"""
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+
+from result_cache import UnitCache, source_version
+from run_files import atomic_write
+
+ROOT = Path(__file__).resolve().parents[3]
+VALIDATION_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = VALIDATION_DIR / ".run_tmp" / "features"
+SHARED_ROOTS = ("prompts",)
+VERSION = source_version(*sorted(VALIDATION_DIR.glob("*.py")), VALIDATION_DIR / "forbidden_patterns.txt")
+# Worst first
+SEVERITY_ORDER = ("error", "fail", "hard", "warn", "soft", "info", "skip", "ok")
+
+
+def result_file(feature_id: str) -> Path:
+    return RESULTS_DIR / f"{feature_id}.json"
+
+
+def snapshot(feature_id: str) -> dict[str, str | None]:
+    """Root-relative path -> SHA-256 of every input of a feature's result."""
+    feature_dir = ROOT / "features" / feature_id
+    cache = UnitCache(ROOT, feature_dir)  # only read: the validator owns it
+    paths = [p for base in (feature_dir, *(ROOT / r for r in SHARED_ROOTS)) for p in sorted(base.rglob("*")) if p.is_file()]
+    return {p.relative_to(ROOT).as_posix(): cache.digest(p.relative_to(ROOT).as_posix(), p) for p in paths}
+
+
+def worst(severities) -> str:
+    return min(severities, key=SEVERITY_ORDER.index, default="ok")
+
+
+def store(feature_id: str, state: str, stop_reason: str, records: list[dict]) -> None:
+    # A single-feature run checks the whole tree; other units' findings are not this feature's
+    base = str(ROOT / "features" / feature_id)
+    checks: dict[str, list[str]] = {}
+    for r in records:
+        if r["path"] is None or r["path"] == base or r["path"].startswith(base + os.sep):
+            checks.setdefault(r["check"], []).append(r["severity"])
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    atomic_write(result_file(feature_id), json.dumps({
+        "feature_id": feature_id,
+        "version": VERSION,
+        "gate": state,
+        "stop_reason": stop_reason,
+        "checks": {name: worst(sevs) for name, sevs in checks.items()},
+        "inputs": snapshot(feature_id),
+    }, indent=2) + "\n")
+
+
+def load_fresh(feature_id: str) -> dict | None:
+    """The stored result of `feature_id` if nothing it was computed from has changed."""
+    try:
+        data = json.loads(result_file(feature_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != VERSION:
+        return None
+    if data.get("inputs") != snapshot(feature_id):
+        return None
+    return data
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Minimal recursive file watcher for validate_all.py --watch.
+
+Uses Linux inotify through ctypes when libc provides it and falls back to
+polling (size, mtime_ns) snapshots elsewhere. wait() blocks until something
+under the watched directories changes and returns the changed paths, after a
+short debounce so one editor save yields one batch.
+"""
+from __future__ import annotations
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+DEBOUNCE_SECONDS = 0.05
+POLL_SECONDS = 0.5
+
+# inotify(7) event bits
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT = struct.Struct("iIII")
+
+
+class PollWatcher:
+    kind = "polling"
+
+    def __init__(self, dirs: list[Path], interval: float = POLL_SECONDS):
+        self.dirs = dirs
+        self.interval = interval
+        self._snap = self._snapshot()
+
+    def _snapshot(self) -> dict[Path, tuple[int, int]]:
+        snap = {}
+        for top in self.dirs:
+            for dirpath, _, filenames in os.walk(top):
+                for name in filenames:
+                    p = Path(dirpath) / name
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    snap[p] = (st.st_size, st.st_mtime_ns)
+        return snap
+
+    def wait(self) -> set[Path]:
+        while True:
+            time.sleep(self.interval)
+            snap = self._snapshot()
+            changed = {p for p in snap.keys() | self._snap.keys() if snap.get(p) != self._snap.get(p)}
+            self._snap = snap
+            if changed:
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    kind = "inotify"
+
+    def __init__(self, dirs: list[Path], libc):
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wds: dict[int, Path] = {}
+        for top in dirs:
+            self._add_tree(top)
+
+    def _add_tree(self, top: Path) -> None:
+        for dirpath, _, _ in os.walk(top):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                raise OSError(err, f"inotify_add_watch failed for {dirpath}: {os.strerror(err)}")
+            self._wds[wd] = Path(dirpath)
+
+    def _read(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        buf = os.read(self._fd, 64 * 1024)
+        changed = set()
+        off = 0
+        while off < len(buf):
+            wd, mask, _, size = EVENT.unpack_from(buf, off)
+            name = buf[off + EVENT.size: off + EVENT.size + size].rstrip(b"\0")
+            off += EVENT.size + size
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report every watched directory
+                changed.update(self._wds.values())
+                continue
+            base = self._wds.get(wd)
+            if base is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._wds[wd]
+                continue
+            path = base / os.fsdecode(name) if name else base
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+        return changed
+
+    def wait(self) -> set[Path]:
+        changed = set()
+        while not changed:
+            changed = self._read(None)
+        while True:
+            more = self._read(DEBOUNCE_SECONDS)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_watcher(dirs: list[Path], poll: bool = False):
+    """inotify watcher when available (and not `poll`), otherwise polling."""
+    if not poll:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            libc.inotify_init1
+            return InotifyWatcher(dirs, libc)
+        except (OSError, AttributeError):
+            pass
+    return PollWatcher(dirs)
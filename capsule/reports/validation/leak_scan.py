@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Compiled prompt-leakage scanner shared by x_check_leak_and_size.py and the
+packager (tools/final_bundle/verify_and_package.py).
+
+The forbidden set is BUILTIN plus one regex per line of
+forbidden_patterns.txt, all case-insensitive. Rather than running each
+pattern over every document, the set is merged into a few expressions:
+
+- plain phrases (no regex syntax) go into a character trie rendered as a
+  single alternation, so the regex engine walks them like an automaton
+  instead of trying each phrase at every offset;
+- regexes anchored at ^ (only the start of the text, as there is no re.M)
+  become one alternation tried once, at offset 0;
+- the remaining regexes become one alternation scanned with finditer().
+
+However many patterns there are, a document takes at most three passes, and
+every hit is reported with its line number. Regexes that cannot share an
+expression (backreferences, named groups, global inline flags) are scanned
+on their own. The merged source is kept in
+.run_tmp/leak_engine.json, keyed by a digest of the pattern set, and
+rebuilt only when the set changes; compiled regex objects cannot be
+persisted, so each process compiles the stored source once.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+VALIDATION_DIR = Path(__file__).resolve().parent
+PATTERNS_FILE = VALIDATION_DIR / "forbidden_patterns.txt"
+ENGINE_FILE = VALIDATION_DIR / ".run_tmp" / "leak_engine.json"
+ENGINE_FORMAT = 3
+# Longest match (and lookaround) stream_hits() is exact for across piece boundaries
+OVERLAP = 16 * 1024
+FLAGS = re.I
+
+BUILTIN = [
+    r"\bYou are an? (autonomous|AI|model)\b",
+    r"^Purpose\b",
+    r"^Template\b",
+    r"You are generating scaffolding documents only",
+]
+
+GROUP_REF_RE = re.compile(r"\\[1-9]|\(\?P[=<]")
+SPECIAL_RE = re.compile(r"[.^$*+?{}\[\]\\|()#]")
+
+
+class Hit:
+    __slots__ = ("line", "pattern", "text")
+
+    def __init__(self, line: int, pattern: str, text: str):
+        self.line = line
+        self.pattern = pattern
+        self.text = text
+
+    def __repr__(self) -> str:
+        return f"Hit({self.line}, {self.pattern!r}, {self.text!r})"
+
+
+def pattern_sources() -> list[str]:
+    """BUILTIN followed by the valid regexes listed in forbidden_patterns.txt."""
+    sources = list(BUILTIN)
+    try:
+        lines = PATTERNS_FILE.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return sources
+    for line in lines:
+        s = line.strip()
+        if not s or s.startswith("#"):
+            continue
+        try:
+            re.compile(s, FLAGS)
+        except re.error:
+            continue
+        sources.append(s)
+    return sources
+
+
+def is_literal(source: str) -> bool:
+    return SPECIAL_RE.search(source) is None
+
+
+def trie_key(phrase: str) -> str:
+    """The phrase lower-cased for prefix sharing, unless that changes its length
+    (İ lowers to i plus a combining dot, which re.I would no longer match)."""
+    lowered = phrase.lower()
+    return lowered if len(lowered) == len(phrase) else phrase
+
+
+def trie_regex(phrases: list[str]) -> str:
+    """One alternation matching any of `phrases`, factored by common prefix."""
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        alts = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else f"(?:{'|'.join(alts)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+def standalone(source: str) -> bool:
+    """Whether a regex must be scanned on its own instead of as an alternative."""
+    if GROUP_REF_RE.search(source):
+        return True
+    try:
+        re.compile(f"(?:{source})", FLAGS)
+    except re.error:
+        return True
+    return False
+
+
+def anchored(source: str) -> bool:
+    """Whether a regex starts with ^ and has no top-level |, so (without re.M) it
+    can only match at the start of the text."""
+    if not source.startswith("^"):
+        return False
+    depth, i, in_class = 0, 1, False
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = ch != "]"
+        elif ch == "[":
+            in_class = True
+            if source[i + 1:i + 2] == "]":
+                i += 1
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return False
+        i += 1
+    return True
+
+
+def alternation(sources: list[str]) -> str:
+    return "|".join(f"(?:{src})" for src in sources)
+
+
+def build_plan(sources: list[str]) -> dict:
+    """The JSON-serialisable merged form of a pattern set.
+
+    Literal phrases, start-anchored regexes and the other regexes make three
+    expressions rather than one: the regex engine only skips ahead quickly
+    when every alternative starts alike, so mixing them is slower than three
+    passes.
+    """
+    phrases = [s for s in sources if is_literal(s)]
+    groups: dict[str, list[str]] = {"anchored": [], "regexes": [], "separate": []}
+    for src in sources:
+        if is_literal(src):
+            continue
+        if standalone(src):
+            groups["separate"].append(src)
+        else:
+            groups["anchored" if anchored(src) else "regexes"].append(src)
+    return {
+        "trie": trie_regex(sorted({trie_key(s) for s in phrases})),
+        "literals": {s.casefold(): s for s in phrases},
+        "anchored_combined": alternation(groups["anchored"]),
+        "regexes_combined": alternation(groups["regexes"]),
+        **groups,
+    }
+
+
+class LeakScanner:
+    def __init__(self, plan: dict):
+        def compiled(source: str):
+            return re.compile(source, FLAGS) if source else None
+
+        self.trie = compiled(plan["trie"])
+        self.literals = plan["literals"]
+        self.anchored = compiled(plan["anchored_combined"])
+        self.regexes = compiled(plan["regexes_combined"])
+        self.sources = {self.anchored: plan["anchored"], self.regexes: plan["regexes"]}
+        self.separate = [re.compile(src, FLAGS) for src in plan["separate"]]
+
+    def _source(self, m: re.Match) -> str:
+        """The pattern behind a hit; only hits pay for finding it."""
+        if m.re is self.trie:
+            text = m.group()
+            src = self.literals.get(text.casefold())
+            if src is None:
+                # re.I folds one character at a time (dotless i, dotted I
+                # and i all match each other), which casefold() need not mirror
+                src = next((p for p in self.literals.values() if re.fullmatch(re.escape(p), text, FLAGS)),
+                           m.re.pattern)
+            return src
+        for src in self.sources.get(m.re, ()):
+            if re.compile(src, FLAGS).match(m.string, m.start()):
+                return src
+        return m.re.pattern
+
+    def search(self, text: str) -> bool:
+        """Whether any forbidden pattern occurs; stops at the first hit."""
+        if self.anchored is not None and self.anchored.match(text):
+            return True
+        return any(p.search(text) for p in (self.trie, self.regexes, *self.separate) if p is not None)
+
+    def hits(self, text: str) -> list[Hit]:
+        """Every hit in document order, with 1-based line numbers. Each pass
+        reports non-overlapping matches, as finditer() does."""
+        return self.stream_hits((text,))
+
+    def stream_hits(self, pieces: Iterable[str]) -> list[Hit]:
+        """hits() of the concatenated pieces, holding one piece plus a margin.
+
+        Each pass resumes where the whole-text finditer() would. A match is
+        taken only once OVERLAP characters follow it (or at the end), and
+        OVERLAP characters of context are kept before the resume point, so
+        results equal hits() for matches and lookarounds shorter than that.
+        """
+        passes = [p for p in (self.trie, self.regexes, *self.separate) if p is not None]
+        resume = [0] * len(passes)  # absolute offset where each pass continues
+        buf, base, line = "", 0, 1  # buf starts at absolute offset base, on line `line`
+        found: list[tuple[int, Hit]] = []
+
+        def take(m: re.Match) -> None:
+            hit = Hit(line + buf.count("\n", 0, m.start()), self._source(m), m.group())
+            found.append((base + m.start(), hit))
+
+        pending = self.anchored is not None
+        it = iter(pieces)
+        piece = next(it, None)
+        while piece is not None:
+            following = next(it, None)
+            final = following is None
+            buf += piece
+            if pending and (final or len(buf) >= OVERLAP):
+                # Only the start of the text can match, so once is enough
+                m = self.anchored.match(buf)
+                if m:
+                    take(m)
+                pending = False
+            limit = len(buf) - OVERLAP
+            for i, pat in enumerate(passes):
+                pos = resume[i] - base
+                nxt = max(pos, limit)
+                for m in pat.finditer(buf, pos):
+                    if not final and m.end() >= limit:
+                        nxt = m.start()
+                        break
+                    take(m)
+                    nxt = max(m.end(), limit)
+                resume[i] = base + nxt
+            cut = min(resume, default=base + len(buf)) - base - OVERLAP
+            if cut > 0:
+                line += buf.count("\n", 0, cut)
+                buf = buf[cut:]
+                base += cut
+            piece = following
+        found.sort(key=lambda item: item[0])
+        return [hit for _, hit in found]
+
+
+def digest(sources: list[str]) -> str:
+    h = hashlib.sha256(f"{ENGINE_FORMAT}:{FLAGS}".encode())
+    for src in sources:
+        h.update(src.encode("utf-8") + b"\0")
+    return h.hexdigest()
+
+
+def load_plan(sources: list[str]) -> dict:
+    """The merged plan for `sources`, from ENGINE_FILE when it is current."""
+    key = digest(sources)
+    try:
+        data = json.loads(ENGINE_FILE.read_text(encoding="utf-8"))
+        if data.get("digest") == key:
+            return data["plan"]
+    except (OSError, ValueError, KeyError):
+        pass
+    plan = build_plan(sources)
+    try:
+        ENGINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ENGINE_FILE.with_name(f"{ENGINE_FILE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"digest": key, "plan": plan}), encoding="utf-8")
+        os.replace(tmp, ENGINE_FILE)
+    except OSError:
+        pass  # read-only tree: build again next time
+    return plan
+
+
+@lru_cache(maxsize=None)
+def scanner() -> LeakScanner:
+    """The scanner for the current pattern set, built once per process."""
+    return LeakScanner(load_plan(pattern_sources()))
+
+
+def describe(hits: list[Hit], limit: int = 5) -> str:
+    """`line 3, line 17, +2 more` for one-line reports.
+
+    Matched text is left out: reports quoting it would themselves match.
+    """
+    lines = sorted({h.line for h in hits})
+    parts = [f"line {n}" for n in lines[:limit]]
+    if len(lines) > limit:
+        parts.append(f"+{len(lines) - limit} more")
+    return ", ".join(parts)
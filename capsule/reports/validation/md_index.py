@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Single-pass index of a markdown document: `## ` sections and their pipe tables.
+
+One walk over the lines records every section (heading title and line
+range) and, inside each, every table as a maximal run of consecutive lines
+containing "|". Sections and tables are ranges into the document's line
+list, so lookups afterwards copy nothing until asked and a document is
+parsed once however many checks need it; this replaces the per-check
+`^## X\\n((?:.*\\n)+?)(?:^## |\\Z)` searches and line walks.
+
+Headings are lines starting with "## " (as the checks have always matched
+them); text before the first heading is the preamble, a section titled "".
+When a title repeats, section() returns the first; `order` keeps them all.
+Shared by the validators (through corpus.Document.index) and the packager.
+"""
+from __future__ import annotations
+from typing import Callable, Iterator
+
+
+class Table:
+    """Consecutive pipe lines; `start` is the 0-based line number of the first."""
+
+    __slots__ = ("start", "end", "_doc")
+
+    def __init__(self, doc: list[str], start: int, end: int):
+        self._doc = doc
+        self.start = start
+        self.end = end
+
+    @property
+    def lines(self) -> list[str]:
+        return self._doc[self.start:self.end]
+
+    @property
+    def header(self) -> str:
+        return self._doc[self.start]
+
+    @property
+    def rows(self) -> list[str]:
+        return self._doc[self.start + 1:self.end]
+
+
+class Section:
+    """Body of one `## ` heading up to the next; `start` is the heading's line number."""
+
+    __slots__ = ("title", "start", "end", "tables", "_doc")
+
+    def __init__(self, doc: list[str], title: str, start: int):
+        self._doc = doc
+        self.title = title
+        self.start = start
+        self.end = len(doc)
+        self.tables: list[Table] = []
+
+    @property
+    def lines(self) -> list[str]:
+        return self._doc[self.start + 1:self.end]
+
+    @property
+    def text(self) -> str:
+        """Body as it appears in the document, one "\\n" per line."""
+        return "".join(f"{ln}\n" for ln in self.lines)
+
+    def table_lines(self) -> Iterator[str]:
+        for table in self.tables:
+            yield from table.lines
+
+
+class MarkdownIndex:
+    __slots__ = ("lines", "preamble", "order", "sections")
+
+    def __init__(self, lines: list[str]):
+        self.lines = lines
+        self.preamble = Section(lines, "", -1)
+        self.order: list[Section] = []
+        self.sections: dict[str, Section] = {}
+        current = self.preamble
+        table_start = None
+        for i, line in enumerate(lines):
+            heading = line.startswith("## ")
+            if "|" in line and not heading:
+                if table_start is None:
+                    table_start = i
+                continue
+            if table_start is not None:
+                current.tables.append(Table(lines, table_start, i))
+                table_start = None
+            if heading:
+                current.end = i
+                current = Section(lines, line[3:].strip(), i)
+                self.order.append(current)
+                self.sections.setdefault(current.title, current)
+        if table_start is not None:
+            current.tables.append(Table(lines, table_start, len(lines)))
+
+    @classmethod
+    def from_text(cls, text: str) -> "MarkdownIndex":
+        """Index text split on "\\n" only, so bodies round-trip through Section.text."""
+        lines = text.split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        return cls(lines)
+
+    def section(self, title: str) -> Section | None:
+        return self.sections.get(title)
+
+    def find(self, match: Callable[[str], bool]) -> Section | None:
+        """First section, in document order, whose title satisfies `match`."""
+        return next((s for s in self.order if match(s.title)), None)
+
+    def tables(self) -> Iterator[Table]:
+        """Every table in document order, the preamble's first."""
+        yield from self.preamble.tables
+        for section in self.order:
+            yield from section.tables
+
+
+def unknown_rows(index: MarkdownIndex) -> list[str]:
+    """Stripped UNKNOWN Summary rows, without the `ID | ...` header."""
+    section = index.section("UNKNOWN Summary")
+    if section is None:
+        return []
+    rows = (ln.strip() for ln in section.table_lines())
+    return [r for r in rows if r and not r.lower().startswith("id |")]
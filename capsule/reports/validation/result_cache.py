@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache of check results, persisted under .run_tmp/cache/.
+
+One JSON file per unit (top-level entry of capsule/ or features/), so pool
+workers never share a file. Each entry records the SHA-256 of every input
+file and is reused only while all of them are unchanged. A (size, mtime_ns)
+match reuses the recorded hash without reading the file, so an unchanged
+document is not even opened. Keys carry a check version derived from the
+check's source (plus corpus.py and md_index.py, where parsing lives), so
+editing a check or forbidden_patterns.txt invalidates its results.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+VALIDATION_DIR = Path(__file__).resolve().parent
+CACHE_DIR = VALIDATION_DIR / ".run_tmp" / "cache"
+FORMAT = 1
+HASH_CHUNK = 1 << 20
+# Files modified this recently may change again within the same mtime tick;
+# their stat is not trusted on the next run (git's "racily clean" rule).
+RACY_SECONDS = 2.0
+
+
+def source_version(*paths: Path) -> str:
+    h = hashlib.sha256(str(FORMAT).encode())
+    for p in (VALIDATION_DIR / "corpus.py", VALIDATION_DIR / "md_index.py", *paths):
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            h.update(b"\0missing\0")
+    return h.hexdigest()[:16]
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                return h.hexdigest()
+            h.update(chunk)
+
+
+def cache_file(rel: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(rel.encode('utf-8')).hexdigest()[:20]}.json"
+
+
+class UnitCache:
+    """Results and file digests for one unit, loaded and saved as a whole."""
+
+    def __init__(self, root: Path, unit: Path):
+        self.root = root
+        self.rel = unit.relative_to(root).as_posix()
+        self.path = cache_file(self.rel)
+        self.files: dict[str, list] = {}
+        self.entries: dict[str, dict] = {}
+        self._used: set[str] = set()
+        self._seen: dict[str, str | None] = {}
+        self._dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        # Messages embed absolute paths; a moved tree starts cold
+        if data.get("format") == FORMAT and data.get("root") == str(root) and data.get("unit") == self.rel:
+            self.files = data.get("files", {})
+            self.entries = data.get("entries", {})
+
+    def start_run(self) -> None:
+        """Forget per-run bookkeeping so a cache kept in memory serves another run."""
+        self._used.clear()
+        self._seen.clear()
+
+    def digest(self, rel: str, path: Path, read=None) -> str | None:
+        """SHA-256 of a file (None when missing), computed once per run.
+
+        `rel` is the root-relative posix path; `read` supplies the bytes, or
+        None to have the file hashed from disk in chunks.
+        """
+        if rel in self._seen:
+            return self._seen[rel]
+        sha = self._seen[rel] = self._digest(rel, path, read)
+        return sha
+
+    def _digest(self, rel: str, path: Path, read) -> str | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        rec = self.files.get(rel)
+        if rec and rec[0] == st.st_size and rec[1] == st.st_mtime_ns:
+            return rec[2]
+        data = read() if read else None
+        sha = hashlib.sha256(data).hexdigest() if data is not None else file_sha256(path)
+        racy = time.time() - st.st_mtime_ns / 1e9 < RACY_SECONDS
+        self.files[rel] = [st.st_size, None if racy else st.st_mtime_ns, sha]
+        self._dirty = True
+        return sha
+
+    def memo(self, key: str, inputs: dict[str, str | None], compute):
+        self._used.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry["inputs"] == inputs:
+            return entry["value"]
+        value = compute()
+        self.entries[key] = {"inputs": inputs, "value": value}
+        self._dirty = True
+        return value
+
+    def save(self) -> None:
+        """Persist, dropping entries and digests this run no longer touched."""
+        if any(k not in self._used for k in self.entries) or any(k not in self._seen for k in self.files):
+            self.entries = {k: v for k, v in self.entries.items() if k in self._used}
+            self.files = {k: v for k, v in self.files.items() if k in self._seen}
+            self._dirty = True
+        if not self._dirty:
+            return
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "format": FORMAT,
+            "root": str(self.root),
+            "unit": self.rel,
+            "files": self.files,
+            "entries": self.entries,
+        }, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def prune(root: Path, units: list[Path]) -> None:
+    """Remove cache files of units that no longer exist."""
+    keep = {cache_file(u.relative_to(root).as_posix()).name for u in units}
+    if not CACHE_DIR.is_dir():
+        return
+    for p in CACHE_DIR.glob("*.json"):
+        if p.name not in keep:
+            p.unlink(missing_ok=True)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Files that concurrent validator runs share.
+
+Two runs can overlap: a --watch loop next to CI, or parallel chain steps
+for one feature. Each run therefore
+
+- writes its .run_tmp outputs (*.out, results.jsonl, timings.json,
+  profile/, batch_summary.*) into its own .run_tmp/runs/<pid>-* directory
+  and publishes them with os.replace() when it finishes, under a lock, so
+  the outputs in .run_tmp/ always come from one complete run;
+- updates a feature's creation log while holding an advisory lock on its
+  journal (creation_journal.py), so steps are numbered one after another;
+- replaces whole-file reports (validation_summary.md) atomically.
+
+Locks are fcntl.flock() locks, released by the OS if a run dies. Without
+fcntl (not POSIX) runs are not serialised, but writes are still atomic.
+"""
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not POSIX
+    fcntl = None
+
+RUNS_NAME = "runs"
+PUBLISH_LOCK = "publish.lock"
+
+
+@contextmanager
+def locked(path: Path, mode: str = "a+b"):
+    """`path` opened in `mode` under an exclusive advisory lock."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open(mode) as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield f
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Replace `path` so readers see the old or the new text, never a mix."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # exists, owned by someone else
+    return True
+
+
+class RunScratch:
+    """A run's private output directory under <target>/runs/.
+
+    path() maps a published location in `target` to its place here; used as
+    a context manager, the directory's entries replace those in `target` on
+    success and are discarded on error.
+    """
+
+    def __init__(self, target: Path):
+        self.target = target
+        runs = target / RUNS_NAME
+        runs.mkdir(parents=True, exist_ok=True)
+        sweep(runs)
+        self.dir = Path(tempfile.mkdtemp(prefix=f"{os.getpid()}-", dir=runs))
+
+    def path(self, published: Path) -> Path:
+        return self.dir / published.relative_to(self.target)
+
+    def publish(self) -> None:
+        with locked(self.target / RUNS_NAME / PUBLISH_LOCK):
+            for entry in sorted(self.dir.iterdir()):
+                dest = self.target / entry.name
+                if entry.is_dir() and dest.is_dir():
+                    os.replace(dest, self.dir / f".old-{entry.name}")
+                os.replace(entry, dest)
+
+    def __enter__(self) -> "RunScratch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.publish()
+        finally:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def sweep(runs: Path) -> None:
+    """Remove scratch directories left by runs that were killed."""
+    for d in runs.iterdir():
+        pid = d.name.split("-", 1)[0]
+        if d.is_dir() and pid.isdigit() and not pid_alive(int(pid)):
+            shutil.rmtree(d, ignore_errors=True)
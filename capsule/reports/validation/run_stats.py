@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Per-stage cost accounting for validate_all.py.
+
+A stage is one check (or the registry check, the unit scan and the cache
+save). Each unit run reports {ms, files, bytes, rss_kb} per stage; merge()
+sums wall time and reads across units and keeps the highest peak RSS.
+Files and bytes count what Corpus documents read, so a document is charged
+to the first stage that opened it.
+"""
+from __future__ import annotations
+import cProfile
+import io
+import json
+import pstats
+import sys
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+STAGES = [
+    "registry", "scan", "headers", "acceptance", "concurrency", "leaksize", "unknowns",
+    "manualtests", "creationrun", "unknowns_policy", "implementable", "cache",
+]
+TABLE_HEADER = "Stage | Wall (ms) | Files read | Bytes read | Peak RSS (KiB)"
+
+
+def peak_rss_kb() -> int | None:
+    """High-water resident set size of this process so far."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def stage_stat(ms: float, files: int = 0, bytes_read: int = 0) -> dict:
+    return {"ms": ms, "files": files, "bytes": bytes_read, "rss_kb": peak_rss_kb()}
+
+
+def merge(total: dict[str, dict], stats: dict[str, dict]) -> dict[str, dict]:
+    for stage, s in stats.items():
+        t = total.setdefault(stage, {"ms": 0.0, "files": 0, "bytes": 0, "rss_kb": None})
+        t["ms"] += s["ms"]
+        t["files"] += s["files"]
+        t["bytes"] += s["bytes"]
+        if s["rss_kb"] is not None:
+            t["rss_kb"] = max(t["rss_kb"] or 0, s["rss_kb"])
+    return total
+
+
+def ordered(stages: dict[str, dict]) -> list[tuple[str, dict]]:
+    rank = {name: i for i, name in enumerate(STAGES)}
+    return sorted(stages.items(), key=lambda kv: rank.get(kv[0], len(rank)))
+
+
+def table_lines(stages: dict[str, dict]) -> list[str]:
+    lines = [TABLE_HEADER, "--- | --- | --- | --- | ---"]
+    for stage, s in ordered(stages):
+        rss = "-" if s["rss_kb"] is None else str(s["rss_kb"])
+        lines.append(f"{stage} | {s['ms']:.1f} | {s['files']} | {s['bytes']} | {rss}")
+    ms = sum(s["ms"] for s in stages.values())
+    files = sum(s["files"] for s in stages.values())
+    read = sum(s["bytes"] for s in stages.values())
+    rss = max((s["rss_kb"] for s in stages.values() if s["rss_kb"] is not None), default=None)
+    lines.append(f"total | {ms:.1f} | {files} | {read} | {'-' if rss is None else rss}")
+    return lines
+
+
+def write_json(path: Path, stages: dict[str, dict], wall_ms: float) -> None:
+    data = {
+        "wall_ms": round(wall_ms, 3),
+        "peak_rss_kb": peak_rss_kb(),
+        "stages": [
+            {"stage": stage, "wall_ms": round(s["ms"], 3), "files_read": s["files"],
+             "bytes_read": s["bytes"], "peak_rss_kb": s["rss_kb"]}
+            for stage, s in ordered(stages)
+        ],
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def dump_profiles(profiles: dict[str, cProfile.Profile], out_dir: Path, top: int = 25) -> None:
+    """Write <stage>.prof (for pstats/snakeviz) and a cumulative-time <stage>.txt."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stage, prof in profiles.items():
+        prof.dump_stats(str(out_dir / f"{stage}.prof"))
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        (out_dir / f"{stage}.txt").write_text(buf.getvalue(), encoding="utf-8")
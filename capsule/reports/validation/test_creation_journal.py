@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for creation_journal.py: python3 -m unittest test_creation_journal (or pytest)."""
+from __future__ import annotations
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import creation_journal
+from creation_journal import STEP_RE, CreationJournal
+
+ROW = "U-1 | Which store? | Latency | Decide | Ask owner | Moderate"
+
+
+class LogStepTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.report_dir = Path(tmp.name) / "reports"
+        self.report_dir.mkdir()
+        state_dir = creation_journal.STATE_DIR
+        creation_journal.STATE_DIR = Path(tmp.name) / "state"
+        self.addCleanup(setattr, creation_journal, "STATE_DIR", state_dir)
+
+    def journal(self) -> CreationJournal:
+        return CreationJournal(self.report_dir, "feat-x")
+
+    def log(self) -> list[str]:
+        return (self.report_dir / creation_journal.LOG_NAME).read_text(encoding="utf-8").splitlines()
+
+    def test_reported_step_rows_are_not_appended(self):
+        self.journal().log_step("2026-01-01", "FAIL", [])
+        step_row = next(ln for ln in self.log() if STEP_RE.match(ln))
+        self.assertEqual(step_row, "1 | (all) | FAIL | - | -")
+        # As the checks report a copy of the log: its step row among the UNKNOWN rows
+        reported = ["File: copy/creation_run.md", creation_journal.STEP_TABLE_HEADER, step_row,
+                    "7 | intent_card.md | PASS | - | -", ROW]
+        self.journal().log_step("2026-01-02", "FAIL", reported)
+        steps = [ln for ln in self.log() if STEP_RE.match(ln)]
+        self.assertEqual(steps, ["1 | (all) | FAIL | - | -", "2 | (all) | FAIL | - | -"])
+        self.assertEqual(self.log().count(creation_journal.STEP_TABLE_HEADER), 1)
+        self.assertEqual(self.log().count(ROW), 1)
+
+    def test_unknown_rows_are_added_once(self):
+        self.journal().log_step("2026-01-01", "WARN", [ROW])
+        self.journal().log_step("2026-01-02", "WARN", [ROW])
+        self.assertEqual(self.log().count(ROW), 1)
+        self.assertEqual(self.journal().render().splitlines(), self.log())
+
+
+if __name__ == "__main__":
+    unittest.main()
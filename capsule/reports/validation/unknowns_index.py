@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Persistent index of UNKNOWN Summary rows across features/ and capsule/.
+
+.run_tmp/cache/unknowns.sqlite keeps every UNKNOWN Summary row with its
+feature, document, row ID and impact. A document is parsed again only when
+its content changes: as in result_cache.py, a (size, mtime_ns) match trusts
+the recorded SHA-256, and a changed stat with an unchanged hash only
+refreshes the stat. x_list_unknowns.py and x_check_unknowns_policy.py read
+their rows through UnknownIndex.rows(), so a validator run re-extracts only
+edited documents, and triage queries need no validator run at all.
+
+Usage:
+  unknowns_index.py [--feature FID]... [--impact high|moderate|low] [--id ID]
+                    [--since COMMIT] [--json] [--no-refresh] [--rebuild]
+
+The index is first brought up to date with the working tree (new, edited
+and deleted documents) unless --no-refresh is given. --since COMMIT keeps
+only rows that are not in that commit's documents (matched by document and
+row ID); a commit's rows are read with git once and stored, as commits
+never change.
+
+Examples:
+  unknowns_index.py --impact high              # High-impact unknowns, every feature
+  unknowns_index.py --since v0.3.0 --json      # added since a commit, as JSON
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from corpus import Corpus, Document, decode_text
+from md_index import MarkdownIndex, unknown_rows
+from result_cache import CACHE_DIR, RACY_SECONDS, source_version
+
+ROOT = Path(__file__).resolve().parents[3]
+INDEX_FILE = CACHE_DIR / "unknowns.sqlite"
+# Trees x_list_unknowns.py reads; program reports are not feature documents
+ROOTS = ("features", "capsule")
+SKIP_PREFIX = "capsule/reports/"
+IMPACTS = ("high", "moderate", "low")
+# Stored rows are only as good as the code that extracted them
+VERSION = source_version(Path(__file__))
+TABLE_HEADER = "Feature | Doc | ID | Question | Possible Effects | Recommended Actions | Next Step | Impact (High/Moderate/Low)"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS docs (
+    path TEXT PRIMARY KEY,
+    feature_id TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER,
+    sha256 TEXT NOT NULL,
+    indexed_utc TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS unknowns (
+    path TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    feature_id TEXT NOT NULL,
+    doc TEXT NOT NULL,
+    row_id TEXT,
+    question TEXT,
+    impact TEXT,
+    level TEXT,
+    raw TEXT NOT NULL,
+    first_seen_utc TEXT NOT NULL,
+    PRIMARY KEY (path, ordinal)
+);
+CREATE INDEX IF NOT EXISTS unknowns_by_level ON unknowns (level, feature_id);
+CREATE INDEX IF NOT EXISTS unknowns_by_feature ON unknowns (feature_id, row_id);
+CREATE TABLE IF NOT EXISTS commits (sha TEXT PRIMARY KEY, indexed_utc TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS commit_unknowns (
+    sha TEXT NOT NULL,
+    path TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    row_id TEXT,
+    raw TEXT NOT NULL,
+    PRIMARY KEY (sha, path, ordinal)
+);
+"""
+COLUMNS = ("feature_id", "doc", "path", "ordinal", "row_id", "question", "impact", "level", "raw", "first_seen_utc")
+
+
+def utc_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def extract_rows(doc: Document) -> list[str]:
+    """Stripped UNKNOWN Summary rows of a document; none when it cannot be read."""
+    try:
+        index = doc.index
+    except Exception:
+        return []
+    return unknown_rows(index)
+
+
+def cells(raw: str) -> list[str]:
+    return [c.strip() for c in raw.split("|") if c.strip()]
+
+
+def parse_row(raw: str) -> tuple[str | None, str | None, str | None, str | None]:
+    """(row ID, question, impact, impact level); only the ID for malformed rows."""
+    parts = cells(raw)
+    if len(parts) < 6:
+        return (parts[0] if parts else None), None, None, None
+    impact = parts[-1]
+    level = next((lv for lv in IMPACTS if impact.lower().startswith(lv)), None)
+    return parts[0], parts[1], impact, level
+
+
+def split_path(rel: str) -> tuple[str, str]:
+    """(feature_id, path inside the feature) for features/<fid>/..., else ("", rel)."""
+    parts = rel.split("/", 2)
+    if parts[0] == "features" and len(parts) == 3:
+        return parts[1], parts[2]
+    return "", rel
+
+
+def indexed(rel: str) -> bool:
+    return not rel.startswith(SKIP_PREFIX) and rel.endswith(".md")
+
+
+def git(*args: str) -> bytes:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, check=True).stdout
+
+
+def git_blobs(shas: list[str]):
+    """Yield the content of each blob, in order, from one `git cat-file --batch`."""
+    proc = subprocess.Popen(["git", "cat-file", "--batch"], cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        for sha in shas:
+            proc.stdin.write(f"{sha}\n".encode())
+            proc.stdin.flush()
+            header = proc.stdout.readline().split()
+            if len(header) != 3:
+                raise RuntimeError(f"git cat-file: no object {sha}")
+            data = proc.stdout.read(int(header[2]))
+            proc.stdout.read(1)
+            yield data
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+class UnknownIndex:
+    def __init__(self, path: Path = INDEX_FILE, root: Path = ROOT):
+        self.root = Path(root)
+        self._prefix = len(str(self.root)) + 1
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Pool workers write their own units; WAL lets readers run alongside
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != VERSION:
+            self.clear()
+
+    def clear(self) -> None:
+        with self.db:
+            for table in ("docs", "unknowns", "commits", "commit_unknowns"):
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (VERSION,))
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def _rel(self, path: Path) -> str:
+        return str(path)[self._prefix:].replace(os.sep, "/")
+
+    def _stored(self, rel: str) -> list[str]:
+        return [raw for (raw,) in self.db.execute("SELECT raw FROM unknowns WHERE path = ? ORDER BY ordinal", (rel,))]
+
+    def rows(self, path: Path, doc: Document, reuse: bool = True) -> list[str]:
+        """Stripped UNKNOWN Summary rows of one document, in table order.
+
+        Parsed only when the content changed since it was indexed, or always
+        with reuse=False; either way the index is updated (commit() to save).
+        """
+        rel = self._rel(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return []
+        rec = self.db.execute("SELECT size, mtime_ns, sha256 FROM docs WHERE path = ?", (rel,)).fetchone()
+        if reuse and rec and rec[0] == st.st_size and rec[1] == st.st_mtime_ns:
+            return self._stored(rel)
+        try:
+            sha = hashlib.sha256(doc.data).hexdigest()
+        except Exception:
+            return []
+        racy = time.time() - st.st_mtime_ns / 1e9 < RACY_SECONDS
+        mtime = None if racy else st.st_mtime_ns
+        if reuse and rec and rec[2] == sha:
+            self.db.execute("UPDATE docs SET size = ?, mtime_ns = ? WHERE path = ?", (st.st_size, mtime, rel))
+            return self._stored(rel)
+        rows = extract_rows(doc)
+        self._store(rel, st.st_size, mtime, sha, rows)
+        return rows
+
+    def _store(self, rel: str, size: int, mtime: int | None, sha: str, rows: list[str]) -> None:
+        fid, doc = split_path(rel)
+        now = utc_iso()
+        # A row keeps its first-seen time while its ID (or text, without one) stays
+        seen = {row_id or raw: first for row_id, raw, first in self.db.execute(
+            "SELECT row_id, raw, first_seen_utc FROM unknowns WHERE path = ?", (rel,))}
+        self.db.execute("DELETE FROM unknowns WHERE path = ?", (rel,))
+        self.db.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?, ?, ?, ?)", (rel, fid, size, mtime, sha, now))
+        records = []
+        for i, raw in enumerate(rows):
+            row_id, question, impact, level = parse_row(raw)
+            records.append((rel, i, fid, doc, row_id, question, impact, level, raw, seen.get(row_id or raw, now)))
+        self.db.executemany(f"INSERT INTO unknowns VALUES ({', '.join('?' * 10)})", records)
+
+    def prune(self, under: Path, keep: list[Path]) -> None:
+        """Forget documents at or below `under` other than `keep` (deleted, or no longer indexed)."""
+        rel = self._rel(under)
+        keep_rel = {self._rel(p) for p in keep}
+        stale = [p for (p,) in self.db.execute(
+            "SELECT path FROM docs WHERE path = ? OR substr(path, 1, ?) = ?", (rel, len(rel) + 1, f"{rel}/"))
+            if p not in keep_rel]
+        for p in stale:
+            self.db.execute("DELETE FROM unknowns WHERE path = ?", (p,))
+            self.db.execute("DELETE FROM docs WHERE path = ?", (p,))
+
+    def refresh(self, reuse: bool = True) -> None:
+        """Bring the index up to date with every indexed document in the tree."""
+        corpus = Corpus(self.root, bases=ROOTS)
+        for base in ROOTS:
+            top = self.root / base
+            paths = [p for p in corpus.files(top) if indexed(self._rel(p))]
+            for p in paths:
+                # A fresh Document each: the whole tree is never held at once
+                self.rows(p, Document(p), reuse)
+            self.prune(top, paths)
+        self.commit()
+
+    def query(self, features=(), level: str | None = None, row_id: str | None = None,
+              since: str | None = None) -> list[dict]:
+        where, args = [], []
+        if features:
+            where.append(f"feature_id IN ({', '.join('?' * len(features))})")
+            args.extend(features)
+        if level:
+            where.append("level = ?")
+            args.append(level)
+        if row_id:
+            where.append("row_id = ?")
+            args.append(row_id)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM unknowns"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY feature_id, path, ordinal"
+        found = [dict(zip(COLUMNS, r)) for r in self.db.execute(sql, args)]
+        if since:
+            before = self.commit_rows(since)
+            found = [r for r in found if (r["path"], r["row_id"] or r["raw"]) not in before]
+        return found
+
+    def commit_rows(self, commit: str) -> set[tuple[str, str]]:
+        """(path, row ID or text) of every UNKNOWN row in a commit's documents."""
+        sha = git("rev-parse", "--verify", f"{commit}^{{commit}}").decode().strip()
+        if self.db.execute("SELECT 1 FROM commits WHERE sha = ?", (sha,)).fetchone() is None:
+            self._index_commit(sha)
+        return {(path, row_id or raw) for path, row_id, raw in self.db.execute(
+            "SELECT path, row_id, raw FROM commit_unknowns WHERE sha = ?", (sha,))}
+
+    def _index_commit(self, sha: str) -> None:
+        blobs = []
+        for entry in git("ls-tree", "-r", "-z", sha, "--", *ROOTS).decode().split("\0"):
+            if not entry:
+                continue
+            info, path = entry.split("\t", 1)
+            _, kind, blob = info.split()
+            if kind == "blob" and indexed(path):
+                blobs.append((path, blob))
+        records = []
+        for (path, _), data in zip(blobs, git_blobs([b for _, b in blobs])):
+            try:
+                rows = unknown_rows(MarkdownIndex.from_text(decode_text(data)))
+            except Exception:
+                continue
+            records.extend((sha, path, i, parse_row(raw)[0], raw) for i, raw in enumerate(rows))
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO commit_unknowns VALUES (?, ?, ?, ?, ?)", records)
+            self.db.execute("INSERT OR REPLACE INTO commits VALUES (?, ?)", (sha, utc_iso()))
+
+
+class CorpusRows:
+    """UnknownIndex's reading interface without the index: every document is
+    parsed and nothing is stored, for runs without a result cache."""
+
+    def rows(self, path: Path, doc: Document, reuse: bool = True) -> list[str]:
+        return extract_rows(doc)
+
+    def prune(self, under: Path, keep: list[Path]) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+
+_open: dict[int, UnknownIndex] = {}
+
+
+def open_index(corpus: Corpus | None = None) -> UnknownIndex | CorpusRows:
+    """This process's index; a forked pool worker opens its own connection.
+
+    A corpus without a result cache (validate_all.py --no-cache) gets
+    CorpusRows, so such a run writes nothing under .run_tmp/cache.
+    """
+    if corpus is not None and corpus.cache is None:
+        return CorpusRows()
+    pid = os.getpid()
+    if pid not in _open:
+        _open[pid] = UnknownIndex()
+    return _open[pid]
+
+
+def format_rows(found: list[dict]) -> list[str]:
+    lines = [TABLE_HEADER]
+    for r in found:
+        lines.append(" | ".join([r["feature_id"] or "-", r["doc"], *cells(r["raw"])]))
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Query the UNKNOWN Summary index")
+    ap.add_argument("--feature", action="append", default=[], help="Only this feature (repeatable)")
+    ap.add_argument("--impact", choices=IMPACTS, help="Only rows of this impact")
+    ap.add_argument("--id", dest="row_id", help="Only rows with this ID")
+    ap.add_argument("--since", metavar="COMMIT", help="Only rows not present at COMMIT")
+    ap.add_argument("--json", action="store_true", help="Print the rows as JSON")
+    ap.add_argument("--no-refresh", action="store_true", help="Query the index as it is")
+    ap.add_argument("--rebuild", action="store_true", help="Drop the index and re-parse every document")
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    index = UnknownIndex()
+    if args.rebuild:
+        index.clear()
+    if not args.no_refresh:
+        index.refresh(reuse=not args.rebuild)
+    try:
+        found = index.query(args.feature, args.impact, args.row_id, args.since)
+    except subprocess.CalledProcessError as e:
+        print(f"ERROR: git {' '.join(e.cmd[1:])}: {e.stderr.decode(errors='replace').strip()}", file=sys.stderr)
+        raise SystemExit(2)
+    if args.json:
+        print(json.dumps(found, indent=2))
+    else:
+        for line in format_rows(found):
+            print(line)
+    print(f"{len(found)} unknown(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Validation loop with gating and logging, run in a single interpreter.
+
+PASS -> proceed; WARN -> proceed and log; FAIL -> stop
+
+Runs the prompts registry check, the document header check and every
+x_check_* script in-process instead of starting one Python per document.
+validate_all.sh is a thin wrapper around this module.
+
+Every result is recorded in .run_tmp/results.jsonl (see check_results.py);
+the gate, the .run_tmp/*.out files and validation_summary.md all derive
+from those records.
+A feature's gate and per-check severities are also kept, with the hashes
+of its inputs, in .run_tmp/features/<fid>.json (see feature_results.py),
+so the packager can reuse a fresh result instead of validating again.
+
+Runs may overlap (a --watch loop beside CI, parallel chain steps): each
+writes its .run_tmp outputs to a private directory and publishes them when
+it finishes, and steps are appended to creation_run.md under a lock on the
+feature's journal, so they are numbered in sequence (see run_files.py).
+
+Usage:
+  FEATURE_ID=<fid> [DOC_PATH=<path>] [STEP=<n>] [DECISIONS="<notes>"] [LINKS="<path|url>"] \\
+    python3 capsule/reports/validation/validate_all.py [--full-tree] [--jobs N] [--watch [--poll]]
+  python3 capsule/reports/validation/validate_all.py [--jobs N] (FEATURE_ID ... | --all-features)
+
+Environment:
+  FEATURE_ID                  Feature to validate; only features/<fid>/ (plus the
+                              prompts registry) is checked, and its
+                              reports/creation_run.md receives the step log
+                              (rendered from reports/creation_run.jsonl; see
+                              creation_journal.py).
+  DOC_PATH                    Document shown in the step row (default: "(all)").
+  STEP                        Step label; auto-increments from the log when unset.
+  DECISIONS, LINKS            Step row columns (default: "-").
+  VALIDATION_ALLOW_HARD_SIZE  1 downgrades the hard size threshold to WARN.
+  REQUIRE_IMPLEMENTABLE       1 escalates WARN to FAIL and marks IMPLEMENTABLE on PASS.
+  VALIDATION_JOBS             Default for --jobs.
+  VALIDATION_FULL_TREE        1 is the same as --full-tree.
+
+Options:
+  --full-tree  Check every capsule/ and features/ entry even when FEATURE_ID
+               is set (the only mode when it is not).
+  --jobs N     Check top-level capsule/ and features/ entries across N worker
+               processes (0 = all CPUs). Output is identical to a serial run.
+  --no-cache   Recompute every result instead of reusing .run_tmp/cache/
+               entries for unchanged files (see result_cache.py).
+  --watch      Validate, then revalidate whenever a file in scope changes,
+               until interrupted. Results stay in memory between runs, so
+               only checks whose input files changed are re-run; each run
+               appends its creation_run.md step as usual.
+  --poll       With --watch, poll file stats instead of using inotify.
+  --profile    Run in-process and write cProfile output per check
+               (<stage>.prof and a cumulative-time <stage>.txt) to
+               .run_tmp/profile/, and print a per-stage Timing table.
+
+Every run writes per-stage wall time, files and bytes read and peak RSS to
+.run_tmp/timings.json. They are kept out of validation_summary.md, which
+stays identical between runs over an unchanged tree.
+
+Batch mode:
+  Feature IDs given as arguments, or --all-features for every directory
+  under features/, are validated in one run: the registry is checked once,
+  each feature gets its own gate, creation_run.md step and
+  validation_summary.md, and .run_tmp/batch_summary.md (plus .json)
+  aggregates the gates. Exits 1 when any feature fails.
+"""
+from __future__ import annotations
+import argparse
+import cProfile
+import datetime as dt
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import check_document_headers
+import check_results
+import feature_results
+import file_watch
+import check_registry
+import x_check_acceptance_schema
+import x_check_concurrency
+import x_check_creation_run
+import x_check_implementable
+import x_check_leak_and_size
+import x_check_manual_tests
+import x_check_unknowns_policy
+import x_list_unknowns
+from corpus import Corpus, scope_bases
+from creation_journal import CreationJournal
+from run_files import RunScratch, atomic_write
+import result_cache
+import run_stats
+
+ROOT = Path(__file__).resolve().parents[3]
+VALIDATION_DIR = Path(__file__).resolve().parent
+TMP_DIR = VALIDATION_DIR / ".run_tmp"
+
+HEADER_ROOTS = (ROOT / "capsule", ROOT / "features")
+HEADERS_VERSION = result_cache.source_version(Path(__file__), VALIDATION_DIR / "check_document_headers.py")
+
+RESULTS_FILE = TMP_DIR / "results.jsonl"
+TIMINGS_FILE = TMP_DIR / "timings.json"
+PROFILE_DIR = TMP_DIR / "profile"
+BATCH_REPORT = TMP_DIR / "batch_summary.md"
+BATCH_JSON = TMP_DIR / "batch_summary.json"
+
+# Check id -> module providing ROOTS and check_unit(unit, corpus); insertion
+# order is the order .run_tmp/<check id>.out files are written and echoed.
+UNIT_CHECKS = {
+    "acceptance": x_check_acceptance_schema,
+    "concurrency": x_check_concurrency,
+    "leaksize": x_check_leak_and_size,
+    "unknowns": x_list_unknowns,
+    "manualtests": x_check_manual_tests,
+    "creationrun": x_check_creation_run,
+    "unknowns_policy": x_check_unknowns_policy,
+}
+
+# Summary sections in report order: (title, check id)
+SUMMARY_SECTIONS = [
+    ("Registry", "registry"),
+    ("Headers", "headers"),
+    ("Acceptance/Schema", "acceptance"),
+    ("Concurrency", "concurrency"),
+    ("Leak/Size", "leaksize"),
+    ("Unknowns", "unknowns"),
+    ("Unknowns Policy", "unknowns_policy"),
+    ("Implementable Check", "implementable"),
+    ("Creation Run Check", "creationrun"),
+]
+
+# Applied in order after the registry and header results:
+# (check id, severity, action, stop reason). "hard" fails unless
+# VALIDATION_ALLOW_HARD_SIZE=1 downgrades it to a warning.
+GATE_RULES = [
+    ("acceptance", "warn", "warn", ""),
+    ("concurrency", "warn", "warn", ""),
+    ("leaksize", "fail", "fail", "Prompt leakage detected"),
+    ("leaksize", "error", "fail", "Leak scan could not read a document"),
+    ("leaksize", "hard", "hard", "Hard size threshold exceeded (require approval)"),
+    ("leaksize", "soft", "warn", ""),
+    ("manualtests", "fail", "fail", "Manual tests not aligned with schema/acceptance"),
+    ("manualtests", "warn", "warn", ""),
+    ("creationrun", "fail", "fail", "Creation run log invalid"),
+    ("creationrun", "warn", "warn", ""),
+    ("unknowns_policy", "fail", "fail", "Blocking UNKNOWNs present"),
+    ("implementable", "fail", "fail", "Implementable requirements not met"),
+]
+
+
+class Gate:
+    """Running PASS/WARN/FAIL state; the first failure names the stop reason."""
+
+    def __init__(self):
+        self.state = "PASS"
+        self.warnings = 0
+        self.failures = 0
+        self.stop_reason = ""
+
+    def warn(self):
+        self.warnings += 1
+        if self.state == "PASS":
+            self.state = "WARN"
+
+    def fail(self, reason: str):
+        self.state = "FAIL"
+        self.failures += 1
+        if not self.stop_reason:
+            self.stop_reason = reason
+
+
+def write_out(out: RunScratch, name: str, lines: list[str], echo: bool = True) -> None:
+    """Write a check's output to the run's .run_tmp/<name>, echoing it like `tee`."""
+    text = "".join(f"{ln}\n" for ln in lines)
+    out.path(TMP_DIR / name).write_text(text, encoding="utf-8")
+    if echo and text:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+def run_registry(profiles: dict | None = None) -> tuple[list[dict], dict]:
+    """Registry records plus the stage's cost."""
+    out, err = io.StringIO(), io.StringIO()
+    prof = profiles.setdefault("registry", cProfile.Profile()) if profiles is not None else None
+    start = time.perf_counter()
+    if prof is not None:
+        prof.enable()
+    try:
+        rc = check_registry.check_registry(out=out, err=err)
+    finally:
+        if prof is not None:
+            prof.disable()
+    ms = (time.perf_counter() - start) * 1000
+    read = check_registry.REGISTRY.stat().st_size if check_registry.REGISTRY.is_file() else 0
+    stat = run_stats.stage_stat(ms, 1 if read else 0, read)
+    sys.stderr.write(err.getvalue())
+    records = check_results.message_records("registry", [(None, ln) for ln in out.getvalue().splitlines()], ms)
+    records += check_results.message_records("registry", [(None, ln) for ln in err.getvalue().splitlines()], ms)
+    if rc != 0 and not any(r["severity"] in ("fail", "error") for r in records):
+        records.append(check_results.record("registry", None, "fail", f"FAIL: registry check exited with status {rc}", ms))
+    return records, stat
+
+
+def unit_stats(units: dict[Path, list[Path]], by_unit: dict[Path, dict], registry_stat: dict) -> dict[str, dict]:
+    stages = run_stats.merge({}, {"registry": registry_stat})
+    for root in HEADER_ROOTS:
+        for unit in units[root]:
+            run_stats.merge(stages, by_unit[unit]["stats"])
+    return stages
+
+
+def header_field(lines, key: str) -> str:
+    """Mimic `awk -F': ' '/^key:/ {print $2; exit}'` over the document head."""
+    for line in lines:
+        if line.startswith(f"{key}:"):
+            parts = line.split(": ")
+            return parts[1] if len(parts) > 1 else ""
+    return ""
+
+
+def classify_header(doc, is_features: bool) -> tuple[str, list[str]] | None:
+    """(kind, errors) for one document, or None when it is not a generated doc."""
+    placeholders = ("<feature-id>", "<feature_id>")
+    try:
+        head = doc.head
+    except Exception as e:
+        return "unreadable", [f"ERROR: unreadable document {doc.path}: {e}"]
+    if not any(line.startswith("doc_type:") for line in head):
+        return None
+    fid = header_field(head, "feature_id")
+    if is_features:
+        if not fid:
+            return None
+        # For features, feature_id should NOT be placeholder
+        if fid in placeholders:
+            return "placeholder", []
+    elif fid in placeholders or not fid:
+        # Skip placeholder skeletons that use the literal '<feature-id>' or '<feature_id>'
+        return "skip", []
+    errors = check_document_headers.header_errors(doc)
+    return ("invalid" if errors else "ok"), errors
+
+
+def header_events(unit: Path, corpus: Corpus) -> list[tuple[str, str, list[str]]]:
+    """Classify every generated doc (one with a doc_type: line) in a unit.
+
+    Returns (kind, path, errors) tuples; gating is applied later, in order,
+    by apply_header_events so parallel and serial runs agree.
+    """
+    events = []
+    is_features = unit.parent == ROOT / "features"
+    for path in corpus.files(unit):
+        res = corpus.memo("headers", HEADERS_VERSION, path, [path],
+                          lambda: classify_header(corpus.doc(path), is_features))
+        if res is not None:
+            kind, errors = res
+            events.append((kind, str(path), errors))
+    return events
+
+
+HEADER_SEVERITY = {
+    "ok": ("ok", "OK: header is valid"),
+    "skip": ("skip", "SKIP: skeleton"),
+    "placeholder": ("warn", "WARN: placeholder feature_id"),
+    "invalid": ("fail", ""),
+    "unreadable": ("error", ""),
+}
+
+
+def header_records(events, duration_ms: float) -> list[dict]:
+    """Records for header events; invalid docs carry their error lines as the message."""
+    records = []
+    for kind, path, errors in events:
+        severity, message = HEADER_SEVERITY[kind]
+        records.append(check_results.record("headers", path, severity, message or "\n".join(errors), duration_ms))
+    return records
+
+
+def check_unit(task: tuple[Path, str, bool]) -> dict[str, list]:
+    """Pool entry point: check one unit with its cache loaded from disk."""
+    unit, feature_id, use_cache = task
+    return run_unit_checks(unit, feature_id, result_cache.UnitCache(ROOT, unit) if use_cache else None)
+
+
+def run_unit_checks(unit: Path, feature_id: str, cache, profiles: dict | None = None) -> dict[str, list]:
+    """Run every per-unit check for one top-level entry of capsule/ or features/.
+
+    Runs in a pool worker when --jobs > 1; the unit is scanned and read on its
+    own, and crashes are returned as text so the parent reports them in order.
+    Each unit owns its cache file, so workers never write the same one.
+    Per-stage costs go to results["stats"]; `profiles` collects one
+    cProfile.Profile per stage (serial runs only).
+    """
+    if cache is not None:
+        cache.start_run()
+    start = time.perf_counter()
+    corpus = Corpus(ROOT, bases=(unit.relative_to(ROOT),), cache=cache)
+    results: dict = {"errors": [], "stats": {"scan": run_stats.stage_stat((time.perf_counter() - start) * 1000)}}
+
+    def guarded(name, fn):
+        files, read = corpus.stats["files"], corpus.stats["bytes"]
+        prof = profiles.setdefault(name, cProfile.Profile()) if profiles is not None else None
+        start = time.perf_counter()
+        try:
+            if prof is not None:
+                prof.enable()
+            results[name] = fn()
+        except Exception:
+            results["errors"].append(f"ERROR: {name} check crashed on {unit}\n{traceback.format_exc()}")
+        finally:
+            if prof is not None:
+                prof.disable()
+            results["stats"][name] = run_stats.stage_stat(
+                (time.perf_counter() - start) * 1000, corpus.stats["files"] - files, corpus.stats["bytes"] - read)
+
+    if unit.parent in HEADER_ROOTS:
+        guarded("headers", lambda: header_events(unit, corpus))
+    for name, module in UNIT_CHECKS.items():
+        if unit.parent in module.ROOTS:
+            guarded(name, lambda: module.check_unit(unit, corpus))
+    if feature_id and unit == ROOT / "features" / feature_id:
+        guarded("implementable", lambda: x_check_implementable.collect(feature_id, corpus))
+    if cache is not None:
+        guarded("cache", cache.save)
+    return results
+
+
+def list_units(bases: tuple[str, ...]) -> dict[Path, list[Path]]:
+    """Top-level entries to check per root; a scoped run lists only its feature."""
+    units: dict[Path, list[Path]] = {root: [] for root in HEADER_ROOTS}
+    for base in bases:
+        top = ROOT / base
+        if top in units:
+            units[top] = sorted(top.iterdir()) if top.is_dir() else []
+        elif top.parent in units and top.is_dir():
+            units[top.parent].append(top)
+    return units
+
+
+def run_units(units: dict[Path, list[Path]], feature_id: str, jobs: int, use_cache: bool,
+              caches: dict | None = None, batch: bool = False, profiles: dict | None = None) -> dict[Path, dict]:
+    """Check all units, serially or across a process pool; keyed by unit path.
+
+    `caches` keeps UnitCaches in memory across calls (watch mode) and
+    `profiles` collects cProfile data; both run in this process.
+    With `batch`, every feature unit is also checked as its own FEATURE_ID.
+    """
+    tasks = [(u, u.name if batch else feature_id, use_cache) for root in HEADER_ROOTS for u in units[root]]
+    if caches is not None or profiles is not None:
+        results = []
+        for unit, fid, _ in tasks:
+            cache = None
+            if use_cache:
+                cache = caches.get(unit) if caches is not None else None
+                if cache is None:
+                    cache = result_cache.UnitCache(ROOT, unit)
+                    if caches is not None:
+                        caches[unit] = cache
+            results.append(run_unit_checks(unit, fid, cache, profiles))
+    elif jobs > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(check_unit, tasks, chunksize=chunksize))
+    else:
+        results = [check_unit(t) for t in tasks]
+    by_unit = {}
+    for (unit, _, _), res in zip(tasks, results):
+        by_unit[unit] = res
+        for err in res["errors"]:
+            print(err, file=sys.stderr, end="")
+    return by_unit
+
+
+def unit_records(name: str, roots, units: dict[Path, list[Path]], by_unit: dict[Path, dict]) -> list[dict]:
+    """One check's records across units, in the order a serial tree walk yields."""
+    records = []
+    for root in roots:
+        for unit in units[root]:
+            res = by_unit[unit]
+            if name not in res:
+                continue
+            ms = res["stats"][name]["ms"] if name in res["stats"] else 0.0
+            if name == "headers":
+                records.extend(header_records(res[name], ms))
+            elif name == "unknowns":
+                for path, rows in res[name]:
+                    records.extend(check_results.record(name, path, "info", row, ms) for row in rows)
+            else:
+                records.extend(check_results.message_records(name, res[name], ms))
+    return records
+
+
+def run_checks(feature_id: str, units, by_unit) -> dict[str, list[dict]]:
+    """Records of every x_check_* check, keyed by check id in output order."""
+    by_check = {name: unit_records(name, module.ROOTS, units, by_unit) for name, module in UNIT_CHECKS.items()}
+    unit = ROOT / "features" / feature_id if feature_id else None
+    if unit in by_unit and "implementable" in by_unit[unit]:
+        impl = unit_records("implementable", (unit.parent,), {unit.parent: [unit]}, by_unit)
+    else:
+        # No feature unit to scan: reports "not set" or "feature folder missing"
+        start = time.perf_counter()
+        msgs = x_check_implementable.collect(feature_id or None, Corpus(ROOT, bases=()))
+        impl = check_results.message_records("implementable", msgs, (time.perf_counter() - start) * 1000)
+    by_check["implementable"] = impl
+    return by_check
+
+
+def feature_checks(feature_id: str, by_unit: dict[Path, dict], registry: list[dict]) -> dict[str, list[dict]]:
+    """Records of one feature in a batch, keyed by check id in report order."""
+    unit = ROOT / "features" / feature_id
+    units: dict[Path, list[Path]] = {root: [] for root in HEADER_ROOTS}
+    if unit in by_unit:
+        units[unit.parent] = [unit]
+    by_check = {"registry": registry, "headers": unit_records("headers", HEADER_ROOTS, units, by_unit)}
+    by_check.update(run_checks(feature_id, units, by_unit))
+    return by_check
+
+
+def gate_records(records: list[dict], feature_id: str, allow_hard_size: bool) -> Gate:
+    """Derive PASS/WARN/FAIL from check records; the first failure names the stop."""
+    gate = Gate()
+    present = {(r["check"], r["severity"]) for r in records}
+    registry_failed = ("registry", "fail") in present or ("registry", "error") in present
+    if registry_failed:
+        gate.fail("Registry check failed")
+    for r in records:
+        if r["check"] != "headers":
+            continue
+        if r["severity"] == "warn":
+            gate.warn()
+        elif r["severity"] in ("fail", "error"):
+            gate.fail(f"Header validation failed in {r['path']}")
+    # The round-trip replays the registry result
+    if registry_failed:
+        gate.fail("Registry round-trip failed")
+    for check, severity, action, reason in GATE_RULES:
+        if (check, severity) not in present:
+            continue
+        if action == "warn" or (action == "hard" and allow_hard_size):
+            gate.warn()
+        else:
+            gate.fail(reason)
+    # UNKNOWNs handling: warn if unknowns present but assumptions.md missing for this feature
+    if feature_id and any(r["check"] == "unknowns" for r in records):
+        if not (ROOT / "features" / feature_id / "assumptions.md").is_file():
+            gate.warn()
+    return gate
+
+
+def log_step(feature_id: str, gate: Gate, unknowns: list[dict]) -> None:
+    """Append the step row and new UNKNOWN rows to reports/creation_run.md, through its journal."""
+    report_dir = ROOT / "features" / feature_id / "reports"
+    report_dir.mkdir(parents=True, exist_ok=True)
+    journal = CreationJournal(report_dir, feature_id)
+    # The log's own UNKNOWN Summary rows (its step rows among them) are in it already
+    rows = [r["message"] for r in unknowns if r["path"] != str(journal.log_file)]
+    journal.log_step(
+        dt.date.today().isoformat(),
+        gate.state,
+        rows,
+        step=os.environ.get("STEP", ""),
+        doc=os.environ.get("DOC_PATH", "") or "(all)",
+        decisions=os.environ.get("DECISIONS", "") or "-",
+        links=os.environ.get("LINKS", "") or "-",
+    )
+
+
+def write_summary(feature_id: str, gate: Gate, by_check: dict[str, list[dict]]) -> None:
+    """Emit a brief validation summary next to the creation log, from the records."""
+    sum_file = ROOT / "features" / feature_id / "reports" / "validation_summary.md"
+    parts = [
+        "## Validation Run\n",
+        f"Gate: {gate.state}\n",
+        f"Warnings: {gate.warnings}, Failures: {gate.failures}\n",
+    ]
+    for title, name in SUMMARY_SECTIONS:
+        # Literal "\n" matches the historical `echo "\n### ...\n"` output
+        parts.append(f"\\n### {title}\\n\n")
+        parts.extend(f"{ln}\n" for ln in check_results.render(name, by_check.get(name, [])))
+    atomic_write(sum_file, "".join(parts))
+
+
+def escalate(gate: Gate, require_implementable: bool) -> bool:
+    """Under REQUIRE_IMPLEMENTABLE=1 a WARN gate becomes FAIL; True when it did."""
+    if require_implementable and gate.state == "WARN":
+        gate.fail("WARN present under implementable enforcement")
+        return True
+    return False
+
+
+def need_hint(stop_reason: str) -> str:
+    """Provide a heuristic NEED suggestion"""
+    if "Header validation" in stop_reason:
+        return "NEED: Fix header order/fields and canonical schema_ref URN"
+    if "Registry" in stop_reason:
+        return "NEED: Ensure prompts/registry.json matches templates, then rerun"
+    if "Prompt leakage" in stop_reason:
+        return "NEED: Remove meta-prompt text from generated docs"
+    if "size threshold" in stop_reason:
+        return "NEED: Reduce document length or set VALIDATION_ALLOW_HARD_SIZE=1 with approval"
+    if "Concurrency" in stop_reason:
+        return "NEED: Add Concurrency Targets/Budget and concurrency_targets to schema"
+    if "Implementable" in stop_reason:
+        return "NEED: Ensure all required docs exist and headers are valid; resolve blocking UNKNOWNs"
+    return ""
+
+
+def mark_implementable(feature_id: str) -> None:
+    today = dt.date.today().isoformat()
+    CreationJournal(ROOT / "features" / feature_id / "reports", feature_id).mark_implementable(today)
+    clog = ROOT / "features" / feature_id / "CHANGELOG.md"
+    if clog.exists():
+        with clog.open("a", encoding="utf-8") as f:
+            f.write(f"{today} | 0.1.0 | governance.creation_run: Marked IMPLEMENTABLE\n")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Run all capsule validation checks with gating and logging.")
+    ap.add_argument("--jobs", type=int, default=int(os.environ.get("VALIDATION_JOBS", "1") or 1),
+                    help="Worker processes for per-unit checks (default: $VALIDATION_JOBS or 1; 0 = all CPUs)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Ignore and do not update the content-hash result cache")
+    ap.add_argument("--full-tree", action="store_true",
+                    default=os.environ.get("VALIDATION_FULL_TREE", "0") == "1",
+                    help="Check all of capsule/ and features/ even when FEATURE_ID is set")
+    ap.add_argument("--watch", action="store_true",
+                    help="Revalidate on every change until interrupted")
+    ap.add_argument("--poll", action="store_true",
+                    help="With --watch, poll for changes instead of using inotify")
+    ap.add_argument("feature_ids", nargs="*", metavar="FEATURE_ID",
+                    help="Validate these features in one batch run")
+    ap.add_argument("--all-features", action="store_true",
+                    help="Validate every directory under features/ in one batch run")
+    ap.add_argument("--profile", action="store_true",
+                    help="Run serially and dump cProfile output per check to .run_tmp/profile/")
+    args = ap.parse_args(argv)
+    if args.watch and (args.feature_ids or args.all_features):
+        ap.error("--watch validates a single FEATURE_ID; it cannot be combined with a batch")
+    return args
+
+
+def validate(args, feature_id: str, caches: dict | None = None) -> int:
+    """One validation run; returns the exit status (1 on FAIL).
+
+    .run_tmp outputs are written to a scratch directory and replace the
+    published ones when the run ends (see run_files.py)."""
+    with RunScratch(TMP_DIR) as out:
+        return validate_run(out, args, feature_id, caches)
+
+
+def validate_run(out: RunScratch, args, feature_id: str, caches: dict | None) -> int:
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    allow_hard_size = os.environ.get("VALIDATION_ALLOW_HARD_SIZE", "0") == "1"
+    require_implementable = os.environ.get("REQUIRE_IMPLEMENTABLE", "0") == "1"
+    started = time.perf_counter()
+    profiles = {} if args.profile else None
+    # Each top-level entry is walked and read once; all checks share that scan
+    bases = scope_bases(feature_id, args.full_tree)
+    if len(bases) == 1:
+        print(f"== Scope: {bases[0]} (--full-tree checks every feature) ==", flush=True)
+    units = list_units(bases)
+    by_unit = run_units(units, feature_id, jobs, use_cache=not args.no_cache, caches=caches, profiles=profiles)
+    if not args.no_cache and len(bases) > 1:
+        # Only a full-tree run knows which units are gone
+        result_cache.prune(ROOT, [u for root in HEADER_ROOTS for u in units[root]])
+
+    by_check: dict[str, list[dict]] = {}
+    print("== Checking prompts registry ==", flush=True)
+    by_check["registry"], registry_stat = run_registry(profiles)
+    reg_lines = check_results.render("registry", by_check["registry"])
+    write_out(out, "registry.out", reg_lines)
+
+    print("== Validating generated documents (with doc_type) ==", flush=True)
+    by_check["headers"] = unit_records("headers", HEADER_ROOTS, units, by_unit)
+    for r in by_check["headers"]:
+        if r["severity"] in ("fail", "error"):
+            print(r["message"], file=sys.stderr)
+    write_out(out, "headers.out", check_results.render("headers", by_check["headers"]))
+
+    # The registry is unchanged within a run; replay the first result
+    print("== Registry round-trip ==", flush=True)
+    write_out(out, "registry.out", reg_lines + reg_lines, echo=False)
+    sys.stdout.write("".join(f"{ln}\n" for ln in reg_lines))
+
+    print("== Additional checks (acceptance/schema, concurrency, leakage/size) ==", flush=True)
+    by_check.update(run_checks(feature_id, units, by_unit))
+    for name in [*UNIT_CHECKS, "implementable"]:
+        write_out(out, f"{name}.out", check_results.render(name, by_check[name]))
+    records = [r for recs in by_check.values() for r in recs]
+    check_results.write_results(out.path(RESULTS_FILE), records)
+    gate = gate_records(records, feature_id, allow_hard_size)
+
+    stages = unit_stats(units, by_unit, registry_stat)
+    run_stats.write_json(out.path(TIMINGS_FILE), stages, (time.perf_counter() - started) * 1000)
+    if profiles is not None:
+        run_stats.dump_profiles(profiles, out.path(PROFILE_DIR))
+        print(f"Note: cProfile output per check written to {PROFILE_DIR.relative_to(ROOT)}/")
+        print("\n".join(["== Timing ==", *run_stats.table_lines(stages)]))
+
+    found = any(r["check"] == "headers" and r["severity"] in ("ok", "fail") for r in records)
+    if not found:
+        print("Note: No generated documents with 'doc_type:' found yet; header validation skipped.")
+
+    # Write per-step creation log if feature context provided
+    if feature_id and (ROOT / "features" / feature_id).is_dir():
+        log_step(feature_id, gate, by_check["unknowns"])
+        write_summary(feature_id, gate, by_check)
+
+    print("== Summary ==")
+    print(f"GATE: {gate.state} (warnings={gate.warnings}, failures={gate.failures})")
+    if escalate(gate, require_implementable):
+        print("Escalating WARN to FAIL due to REQUIRE_IMPLEMENTABLE=1")
+    if gate.state == "FAIL":
+        print(f"STOP: {gate.stop_reason}")
+        hint = need_hint(gate.stop_reason)
+        if hint:
+            print(hint)
+    elif feature_id and (ROOT / "features" / feature_id).is_dir() and require_implementable:
+        # If implementable enforcement is on and all checks passed, mark IMPLEMENTABLE
+        mark_implementable(feature_id)
+    if feature_id and (ROOT / "features" / feature_id).is_dir():
+        feature_results.store(feature_id, gate.state, gate.stop_reason, records)
+
+    print("== Done ==")
+    return 1 if gate.state == "FAIL" else 0
+
+
+def write_batch_report(out: RunScratch, rows: list[dict]) -> None:
+    counts = {state: sum(r["gate"] == state for r in rows) for state in ("PASS", "WARN", "FAIL")}
+    lines = [
+        "## Batch Validation",
+        f"Features: {len(rows)} (PASS {counts['PASS']}, WARN {counts['WARN']}, FAIL {counts['FAIL']})",
+        "",
+        "Feature | Gate | Warnings | Failures | Stop reason",
+        "--- | --- | --- | --- | ---",
+    ]
+    lines += [f"{r['feature_id']} | {r['gate']} | {r['warnings']} | {r['failures']} | {r['stop_reason'] or '-'}" for r in rows]
+    out.path(BATCH_REPORT).write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out.path(BATCH_JSON).write_text(json.dumps(rows, indent=2) + "\n", encoding="utf-8")
+
+
+def validate_batch(args, feature_ids: list[str]) -> int:
+    """Validate many features in one run; returns 1 when any of them fails."""
+    with RunScratch(TMP_DIR) as out:
+        return validate_batch_run(out, args, feature_ids)
+
+
+def validate_batch_run(out: RunScratch, args, feature_ids: list[str]) -> int:
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    allow_hard_size = os.environ.get("VALIDATION_ALLOW_HARD_SIZE", "0") == "1"
+    require_implementable = os.environ.get("REQUIRE_IMPLEMENTABLE", "0") == "1"
+    started = time.perf_counter()
+    profiles = {} if args.profile else None
+    print(f"== Batch: {len(feature_ids)} features ==", flush=True)
+    units = list_units(tuple(f"features/{fid}" for fid in feature_ids))
+    by_unit = run_units(units, "", jobs, use_cache=not args.no_cache, batch=True, profiles=profiles)
+
+    print("== Checking prompts registry ==", flush=True)
+    registry, registry_stat = run_registry(profiles)
+    write_out(out, "registry.out", check_results.render("registry", registry))
+
+    print("== Validating features ==", flush=True)
+    merged: dict[str, list[dict]] = {"registry": registry}
+    rows = []
+    for fid in feature_ids:
+        by_check = feature_checks(fid, by_unit, registry)
+        for r in by_check["headers"]:
+            if r["severity"] in ("fail", "error"):
+                print(r["message"], file=sys.stderr)
+        gate = gate_records([r for recs in by_check.values() for r in recs], fid, allow_hard_size)
+        feature_dir = ROOT / "features" / fid
+        if feature_dir.is_dir():
+            log_step(fid, gate, by_check["unknowns"])
+            write_summary(fid, gate, by_check)
+        escalate(gate, require_implementable)
+        if gate.state != "FAIL" and feature_dir.is_dir() and require_implementable:
+            mark_implementable(fid)
+        if feature_dir.is_dir():
+            feature_results.store(fid, gate.state, gate.stop_reason, [r for recs in by_check.values() for r in recs])
+        stop = f" STOP: {gate.stop_reason}" if gate.state == "FAIL" else ""
+        print(f"{fid}: GATE: {gate.state} (warnings={gate.warnings}, failures={gate.failures}){stop}", flush=True)
+        rows.append({"feature_id": fid, "gate": gate.state, "warnings": gate.warnings,
+                     "failures": gate.failures, "stop_reason": gate.stop_reason})
+        for name, recs in by_check.items():
+            if name != "registry":
+                merged.setdefault(name, []).extend(recs)
+
+    for name in ["headers", *UNIT_CHECKS, "implementable"]:
+        write_out(out, f"{name}.out", check_results.render(name, merged.get(name, [])), echo=False)
+    check_results.write_results(out.path(RESULTS_FILE), [r for recs in merged.values() for r in recs])
+    stages = unit_stats(units, by_unit, registry_stat)
+    run_stats.write_json(out.path(TIMINGS_FILE), stages, (time.perf_counter() - started) * 1000)
+    if profiles is not None:
+        run_stats.dump_profiles(profiles, out.path(PROFILE_DIR))
+        print("\n".join(["== Timing ==", *run_stats.table_lines(stages)]))
+    write_batch_report(out, rows)
+    failed = sum(r["gate"] == "FAIL" for r in rows)
+    print("== Summary ==")
+    print(f"BATCH: {len(rows)} features, {failed} failed; see {BATCH_REPORT.relative_to(ROOT)}")
+    print("== Done ==")
+    return 1 if failed else 0
+
+
+def watch_ignored(path: Path, feature_id: str) -> bool:
+    """Files a run writes itself; reacting to them would loop forever."""
+    if path == TMP_DIR or TMP_DIR in path.parents:
+        return True
+    if not feature_id or path.parent != ROOT / "features" / feature_id / "reports":
+        return False
+    # creation_run.md, its journal and validation_summary.md, with their temp files
+    return path.name.startswith(("creation_run.", "validation_summary.md"))
+
+
+def watch(args, feature_id: str) -> int:
+    """Validate, then revalidate on each batch of changes until interrupted."""
+    bases = scope_bases(feature_id, args.full_tree)
+    dirs = [ROOT / b for b in bases if (ROOT / b).is_dir()]
+    if not dirs:
+        print(f"ERROR: nothing to watch; {', '.join(bases)} not found", file=sys.stderr)
+        return 2
+    caches: dict = {}
+    watcher = file_watch.open_watcher(dirs, poll=args.poll)
+    print(f"== Watching {', '.join(bases)} ({watcher.kind}); Ctrl-C to stop ==", flush=True)
+    try:
+        validate(args, feature_id, caches)
+        while True:
+            changed = sorted(p for p in watcher.wait() if not watch_ignored(p, feature_id))
+            if not changed:
+                continue
+            start = time.perf_counter()
+            shown = ", ".join(p.relative_to(ROOT).as_posix() for p in changed[:3])
+            more = f" (+{len(changed) - 3} more)" if len(changed) > 3 else ""
+            print(f"== Changed: {shown}{more} ==", flush=True)
+            validate(args, feature_id, caches)
+            print(f"== Revalidated in {(time.perf_counter() - start) * 1000:.0f} ms ==", flush=True)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    feature_id = os.environ.get("FEATURE_ID", "")
+    if args.all_features:
+        features = ROOT / "features"
+        return validate_batch(args, sorted(p.name for p in features.iterdir() if p.is_dir()) if features.is_dir() else [])
+    if args.feature_ids:
+        return validate_batch(args, list(dict.fromkeys(args.feature_ids)))
+    if args.watch:
+        return watch(args, feature_id)
+    return validate(args, feature_id)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
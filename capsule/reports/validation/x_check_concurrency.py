@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 from pathlib import Path
-import json
+
+from corpus import Corpus, Document
+from feature_capsule import FeatureCapsule
+from result_cache import source_version
 
 ROOT = Path(__file__).resolve().parents[3]
+VALIDATION_DIR = Path(__file__).resolve().parent
+ROOTS = (ROOT / 'capsule', ROOT / 'features')
+CHECK_VERSION = source_version(Path(__file__), VALIDATION_DIR / 'feature_capsule.py')
 
-def has_md_concurrency(path: Path, titles: list[str]) -> tuple[bool, str]:
+def has_md_concurrency(doc: Document, titles: list[str]) -> tuple[bool, str]:
     try:
-        txt = path.read_text(encoding='utf-8')
+        txt = doc.text
     except Exception:
         return False, "unreadable"
     low = txt.lower()
@@ -26,12 +33,11 @@ def has_md_concurrency(path: Path, titles: list[str]) -> tuple[bool, str]:
             found += 1
     return (found >= 3), ("columns ok" if found >= 3 else "columns incomplete")
 
-def has_schema_concurrency(path: Path) -> tuple[bool, str]:
+def has_schema_concurrency(capsule: FeatureCapsule) -> tuple[bool, str]:
     try:
-        data = json.loads(path.read_text(encoding='utf-8'))
+        ct = capsule.concurrency_targets
     except Exception as e:
         return False, f"schema unreadable: {e}"
-    ct = data.get('concurrency_targets')
     if not isinstance(ct, dict):
         return False, "concurrency_targets missing"
     required_keys = ['throughput_rps', 'latency_ms', 'error_budget_pct', 'window_days']
@@ -43,29 +49,43 @@ def has_schema_concurrency(path: Path) -> tuple[bool, str]:
         return False, "latency_ms missing p50/p95/p99"
     return True, "ok"
 
-def main():
+def check_dir(capsule: FeatureCapsule):
     checks = []
-    for base in (ROOT / 'capsule', ROOT / 'features'):
-        if not base.exists():
-            continue
-        for p in base.glob('*'):
-            if not p.is_dir():
-                continue
-            intent = p / 'intent_card.md'
-            action = p / 'action_budget.md'
-            outc = p / 'output_contract.schema.json'
-            if intent.exists():
-                ok, note = has_md_concurrency(intent, ['Concurrency Targets'])
-                checks.append((intent, 'Concurrency tuple (md)', ok, note))
-            if action.exists():
-                ok, note = has_md_concurrency(action, ['Concurrency Budget', 'Concurrency Targets'])
-                checks.append((action, 'Concurrency tuple (md)', ok, note))
-            if outc.exists():
-                ok, note = has_schema_concurrency(outc)
-                checks.append((outc, 'Concurrency tuple (schema)', ok, note))
+    intent = capsule.path('intent_card.md')
+    action = capsule.path('action_budget.md')
+    outc = capsule.path('output_contract.schema.json')
+    if capsule.exists('intent_card.md'):
+        ok, note = has_md_concurrency(capsule.doc('intent_card.md'), ['Concurrency Targets'])
+        checks.append((intent, 'Concurrency tuple (md)', ok, note))
+    if capsule.exists('action_budget.md'):
+        ok, note = has_md_concurrency(capsule.doc('action_budget.md'), ['Concurrency Budget', 'Concurrency Targets'])
+        checks.append((action, 'Concurrency tuple (md)', ok, note))
+    if capsule.exists('output_contract.schema.json'):
+        ok, note = has_schema_concurrency(capsule)
+        checks.append((outc, 'Concurrency tuple (schema)', ok, note))
+    messages = []
     for path, what, ok, note in checks:
         state = 'OK' if ok else 'WARN'
-        print(f"{path}: {state}: {what} - {note}")
+        messages.append((str(path), f"{state}: {what} - {note}"))
+    return messages
+
+def check_unit(p: Path, corpus: Corpus):
+    if not corpus.is_dir(p):
+        return []
+    inputs = [p / 'intent_card.md', p / 'action_budget.md', p / 'output_contract.schema.json']
+    return corpus.memo('concurrency', CHECK_VERSION, p, inputs, lambda: check_dir(corpus.capsule(p)))
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    messages = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            messages.extend(check_unit(unit, corpus))
+    return messages
+
+def main():
+    for path, msg in collect():
+        print(f"{path}: {msg}")
 
 if __name__ == '__main__':
     main()
@@ -1,16 +1,21 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 from pathlib import Path
 import re
 
+from corpus import Corpus, Document
+
 ROOT = Path(__file__).resolve().parents[3]
+ROOTS = (ROOT / 'features',)
 
 GATE_VALUES = {"PASS", "WARN", "FAIL"}
 
 
-def check_log(path: Path):
+def check_log(doc: Document):
+    path = doc.path
     msgs = []
     try:
-        text = path.read_text(encoding="utf-8")
+        text = doc.text
     except Exception as e:
         return [(str(path), f"FAIL: unreadable: {e}")]
 
@@ -24,7 +29,7 @@ def check_log(path: Path):
 
     # Check steps order and gate values
     steps = []
-    for line in text.splitlines():
+    for line in doc.lines:
         if re.match(r"^\d+\s*\|", line):
             parts = [p.strip() for p in line.split("|")]
             if len(parts) >= 3:
@@ -57,13 +62,23 @@ def check_log(path: Path):
     return msgs
 
 
+def check_unit(unit: Path, corpus: Corpus):
+    capsule = corpus.capsule(unit)
+    return check_log(capsule.doc('reports/creation_run.md')) if capsule.exists('reports/creation_run.md') else []
+
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    messages = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            messages.extend(check_unit(unit, corpus))
+    return messages
+
+
 def main():
-    for base in (ROOT / 'features',):
-        if not base.exists():
-            continue
-        for p in base.glob('*/reports/creation_run.md'):
-            for path, msg in check_log(p):
-                print(f"{path}: {msg}")
+    for path, msg in collect():
+        print(f"{path}: {msg}")
 
 
 if __name__ == '__main__':
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 from pathlib import Path
 import os
 import re
 
+from corpus import Corpus
+from feature_capsule import HEADER_FIELDS, FeatureCapsule
+from result_cache import source_version
+
 ROOT = Path(__file__).resolve().parents[3]
+VALIDATION_DIR = Path(__file__).resolve().parent
+CHECK_VERSION = source_version(Path(__file__), VALIDATION_DIR / 'feature_capsule.py')
 
 REQUIRED_FILES = [
     'vision.md',
@@ -30,36 +37,18 @@ REQUIRED_FILES = [
     'reports/chaos_results.md',
 ]
 
-HEADER_REQUIRED = ["feature_id", "doc_type", "schema_ref", "version", "updated"]
-
-
-def parse_header(text: str):
-    header = {}
-    for line in text.splitlines():
-        if not line.strip():
-            if header:
-                break
-            continue
-        if ':' in line:
-            k, v = line.split(':', 1)
-            header[k.strip()] = v.strip()
-        if len(header) >= 5:
-            pass
-    return header
-
-
-def check_headers(base: Path):
+def check_headers(capsule: FeatureCapsule):
     msgs = []
-    for p in base.rglob('*.md'):
+    for p in capsule.docs:
         try:
-            text = p.read_text(encoding='utf-8')
+            lines = capsule.corpus.doc(p).head
         except Exception as e:
             msgs.append((str(p), f'FAIL: unreadable: {e}'))
             continue
-        if 'doc_type:' not in text.splitlines()[:50]:
+        if 'doc_type:' not in lines[:50]:
             continue
-        header = parse_header(text)
-        missing = [k for k in HEADER_REQUIRED if k not in header]
+        header = capsule.header(p)
+        missing = [k for k in HEADER_FIELDS if k not in header]
         if missing:
             msgs.append((str(p), f'FAIL: missing header fields: {missing}'))
         sref = header.get('schema_ref', '')
@@ -68,24 +57,36 @@ def check_headers(base: Path):
     return msgs
 
 
-def main():
-    fid = os.environ.get('FEATURE_ID')
+def collect(fid=None, corpus: Corpus | None = None):
+    """Return (path, msg) pairs; path is None for run-level notes."""
     if not fid:
-        print('INFO: FEATURE_ID not set; implementable check skipped')
-        return
+        return [(None, 'INFO: FEATURE_ID not set; implementable check skipped')]
+    corpus = corpus or Corpus()
     base = ROOT / 'features' / fid
-    if not base.exists():
-        print(f'FAIL: feature folder missing: {base}')
-        return
+    if not corpus.exists(base):
+        return [(None, f'FAIL: feature folder missing: {base}')]
 
-    missing = [rel for rel in REQUIRED_FILES if not (base / rel).exists()]
+    capsule = corpus.capsule(base)
+    inputs = [base / rel for rel in REQUIRED_FILES] + capsule.docs
+    return corpus.memo('implementable', CHECK_VERSION, base, inputs, lambda: check_feature(capsule))
+
+
+def check_feature(capsule: FeatureCapsule):
+    msgs = []
+    base = capsule.base
+    missing = [rel for rel in REQUIRED_FILES if not capsule.exists(rel)]
     if missing:
-        print(f'{base}: FAIL: missing required documents: {missing}')
+        msgs.append((str(base), f'FAIL: missing required documents: {missing}'))
     else:
-        print(f'{base}: OK: all required documents present')
+        msgs.append((str(base), 'OK: all required documents present'))
 
-    for path, msg in check_headers(base):
-        print(f'{path}: {msg}')
+    msgs.extend(check_headers(capsule))
+    return msgs
+
+
+def main():
+    for path, msg in collect(os.environ.get('FEATURE_ID')):
+        print(f'{path}: {msg}' if path else msg)
 
 
 if __name__ == '__main__':
@@ -1,46 +1,55 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 import re
 from pathlib import Path
 
+from corpus import Corpus, Document
+from leak_scan import PATTERNS_FILE, LeakScanner, describe, scanner
+from result_cache import source_version
+
 ROOT = Path(__file__).resolve().parents[3]
 VALIDATION_DIR = Path(__file__).resolve().parent
+ROOTS = (ROOT / 'features', ROOT / 'capsule')
+CHECK_VERSION = source_version(Path(__file__), VALIDATION_DIR / 'leak_scan.py', PATTERNS_FILE)
 
-FORBIDDEN = [
-    re.compile(r"\bYou are an? (autonomous|AI|model)\b", re.I),
-    re.compile(r"^Purpose\b", re.I),
-    re.compile(r"^Template\b", re.I),
-    re.compile(r"You are generating scaffolding documents only", re.I),
-]
-
-def load_extra_forbidden():
-    extra_file = VALIDATION_DIR / 'forbidden_patterns.txt'
-    if not extra_file.exists():
-        return []
-    pats = []
-    for line in extra_file.read_text(encoding='utf-8').splitlines():
-        s = line.strip()
-        if not s or s.startswith('#'):
-            continue
-        try:
-            pats.append(re.compile(s, re.I))
-        except re.error:
-            continue
-    return pats
+WORD_RE = re.compile(r"\w+")
 
 def word_count(text: str) -> int:
-    return len(re.findall(r"\w+", text))
+    return len(WORD_RE.findall(text))
+
+def counted(pieces, total: list[int]):
+    """Pass pieces through, adding their words to total[0].
 
-def check_file(path: Path):
+    Each piece is counted on its own; a word running across the boundary
+    (a piece ending and the next starting with a word character) is counted
+    once. Nothing is carried between pieces, so the total equals
+    word_count() of the whole text with memory bounded by one piece, even
+    for text without spaces (minified JSON, comma- or tab-separated logs).
+    """
+    in_word = False
+    for piece in pieces:
+        if piece:
+            n = word_count(piece)
+            if in_word and WORD_RE.match(piece):
+                n -= 1
+            total[0] += n
+            in_word = WORD_RE.match(piece, len(piece) - 1) is not None
+        yield piece
+
+def check_file(doc: Document, leaks: LeakScanner | None = None):
+    path = doc.path
+    words = [0]
     try:
-        text = path.read_text(encoding='utf-8')
-    except Exception:
-        return []
+        # Large documents are streamed, so memory stays flat whatever their size
+        hits = (leaks or scanner()).stream_hits(counted(doc.pieces(), words))
+    except (OSError, ValueError) as e:
+        # Unreadable or not UTF-8: say so rather than report a clean document
+        return [(str(path), f'ERROR: cannot scan for leakage: {e}')]
+    wc = words[0]
     msgs = []
-    for pat in FORBIDDEN:
-        if pat.search(text):
-            msgs.append((str(path), 'FAIL: possible prompt leakage'))
-            break
-    wc = word_count(text)
+    # The message prefix is what the shell packager greps for
+    if hits:
+        msgs.append((str(path), f'FAIL: possible prompt leakage ({describe(hits)})'))
     # Rough token estimate ~0.75*words; alert near 800 tokens (~1067 words)
     if wc > 1600*1.35:
         msgs.append((str(path), f'HARD: size very large (~{wc} words)'))
@@ -48,19 +57,26 @@ def check_file(path: Path):
         msgs.append((str(path), f'SOFT: size large (~{wc} words)'))
     return msgs
 
-def main():
+def check_unit(unit: Path, corpus: Corpus):
     results = []
-    # Extend forbidden list dynamically
-    FORBIDDEN.extend(load_extra_forbidden())
-    for base in (ROOT / 'features', ROOT / 'capsule'):
-        if not base.exists():
+    leaks = scanner()
+    for p in corpus.capsule(unit).docs:
+        # Skip program reports
+        if '/reports/' in str(p.as_posix()) and 'features/' not in str(p.as_posix()):
             continue
-        for p in base.rglob('*.md'):
-            # Skip program reports
-            if '/reports/' in str(p.as_posix()) and 'features/' not in str(p.as_posix()):
-                continue
-            results.extend(check_file(p))
-    for path, msg in results:
+        results.extend(corpus.memo('leaksize', CHECK_VERSION, p, [p], lambda: check_file(corpus.doc(p), leaks)))
+    return results
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    messages = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            messages.extend(check_unit(unit, corpus))
+    return messages
+
+def main():
+    for path, msg in collect():
         print(f"{path}: {msg}")
 
 if __name__ == '__main__':
@@ -1,36 +1,16 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 import re
-import json
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[3]
+from corpus import Corpus
+from feature_capsule import FeatureCapsule
+from result_cache import source_version
 
-TESTS_HEADER_RE = re.compile(r"^\s*ID\s*\|\s*Test Name\s*\|\s*Inputs\s*\|\s*Expected Result\s*\|\s*Linked Schema Key\s*\|\s*Status\s*$", re.I)
-
-
-def parse_tests_table(text: str):
-    # Find the Tests section and parse the main table
-    lines = text.splitlines()
-    in_tests = False
-    header_idx = None
-    rows = []
-    for i, ln in enumerate(lines):
-        if ln.strip().lower().startswith("## tests"):
-            in_tests = True
-            continue
-        if in_tests:
-            if ln.strip().startswith("## "):
-                break
-            if header_idx is None and TESTS_HEADER_RE.match(ln.strip()):
-                header_idx = i
-                continue
-            if header_idx is not None and '|' in ln and ln.strip() and not ln.strip().startswith('|-'):
-                parts = [p.strip() for p in ln.split('|')]
-                # Expect 6 columns; be tolerant to leading/ending pipes
-                parts = [p for p in parts if p != '']
-                if len(parts) >= 6:
-                    rows.append(parts[:6])
-    return rows
+ROOT = Path(__file__).resolve().parents[3]
+VALIDATION_DIR = Path(__file__).resolve().parent
+ROOTS = (ROOT / 'features', ROOT / 'capsule')
+CHECK_VERSION = source_version(Path(__file__), VALIDATION_DIR / 'feature_capsule.py')
 
 
 def extract_contract_ref(text: str):
@@ -39,31 +19,29 @@ def extract_contract_ref(text: str):
     return m.group(1) if m else None
 
 
-def check_feature(base: Path):
+def check_feature(capsule: FeatureCapsule):
     msgs = []
+    base = capsule.base
     schema_path = base / 'output_contract.schema.json'
     tests_path = base / 'manual_tests.md'
-    intent_path = base / 'intent_card.md'
 
-    if not schema_path.exists():
+    if not capsule.exists('output_contract.schema.json'):
         return msgs
     try:
-        schema = json.loads(schema_path.read_text(encoding='utf-8'))
+        required = capsule.required_keys
     except Exception as e:
         msgs.append((str(schema_path), f'FAIL: schema unreadable: {e}'))
         return msgs
+    schema_ver = capsule.schema.get('version', '')
 
-    required = schema.get('required') or []
-    schema_ver = schema.get('version', '')
-
-    if not tests_path.exists():
+    if not capsule.exists('manual_tests.md'):
         if required:
             msgs.append((str(tests_path), 'FAIL: manual_tests.md missing while schema.required is non-empty'))
         else:
             msgs.append((str(tests_path), 'WARN: manual_tests.md missing but schema.required is empty'))
         return msgs
 
-    text = tests_path.read_text(encoding='utf-8')
+    text = capsule.doc('manual_tests.md').text
     # Contract version alignment
     contract_ref = extract_contract_ref(text)
     if contract_ref and '@' in contract_ref:
@@ -75,14 +53,12 @@ def check_feature(base: Path):
         msgs.append((str(tests_path), 'WARN: Schema Reference missing or unversioned'))
 
     # Parse Tests table
-    rows = parse_tests_table(text)
+    rows = capsule.manual_tests
     if required and not rows:
         msgs.append((str(tests_path), 'FAIL: Tests table missing while schema.required is non-empty'))
         return msgs
 
-    # Determine Linked Schema Key column index (5th in our structure)
-    linked_keys = [r[4] for r in rows if len(r) >= 5]
-    covered = set([k.strip('` ') for k in linked_keys if k.strip()])
+    covered = set([r.schema_key.strip('` ') for r in rows if r.schema_key.strip()])
     missing = [k for k in required if k not in covered]
     if missing:
         msgs.append((str(tests_path), f'FAIL: required keys without tests: {missing}'))
@@ -96,20 +72,30 @@ def check_feature(base: Path):
 
     # Encourage presence of a reports file
     reports_md = base / 'reports' / 'manual_tests.md'
-    if not reports_md.exists():
+    if not capsule.exists('reports/manual_tests.md'):
         msgs.append((str(reports_md), 'WARN: test run log not found; create /reports/manual_tests.md'))
     return msgs
 
 
+def check_unit(unit: Path, corpus: Corpus):
+    if not corpus.is_dir(unit):
+        return []
+    inputs = [unit / 'output_contract.schema.json', unit / 'manual_tests.md', unit / 'reports' / 'manual_tests.md']
+    return corpus.memo('manualtests', CHECK_VERSION, unit, inputs, lambda: check_feature(corpus.capsule(unit)))
+
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    messages = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            messages.extend(check_unit(unit, corpus))
+    return messages
+
+
 def main():
-    for root in (ROOT / 'features', ROOT / 'capsule'):
-        if not root.exists():
-            continue
-        for p in root.glob('*'):
-            if not p.is_dir():
-                continue
-            for path, msg in check_feature(p):
-                print(f"{path}: {msg}")
+    for path, msg in collect():
+        print(f"{path}: {msg}")
 
 
 if __name__ == '__main__':
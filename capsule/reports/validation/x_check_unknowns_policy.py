@@ -1,48 +1,45 @@
 #!/usr/bin/env python3
-import re
+from __future__ import annotations
 from pathlib import Path
 
+from corpus import Corpus
+from feature_capsule import UnknownRow
+from unknowns_index import open_index
+
 ROOT = Path(__file__).resolve().parents[3]
+ROOTS = (ROOT / 'features',)
 
-def extract_unknown_rows(md_path: Path):
-    try:
-        text = md_path.read_text(encoding='utf-8')
-    except Exception:
-        return []
-    pat = re.compile(r"^## UNKNOWN Summary\n(?P<table>(?:.*\n)+?)^(?:## |\Z)", re.M)
-    m = pat.search(text)
-    if not m:
-        return []
-    rows = [r.strip() for r in m.group('table').splitlines() if '|' in r]
-    rows = [r for r in rows if not r.lower().startswith('id |') and r]
-    return rows
-
-def check_unknowns(base: Path):
+def check_unknowns(base: Path, corpus: Corpus):
     msgs = []
-    for p in base.rglob('*.md'):
+    # Rows come from the UNKNOWN index rather than re-parsing each document
+    index = open_index(corpus)
+    for p in corpus.capsule(base).docs:
         if p.as_posix().startswith((ROOT / 'capsule' / 'reports').as_posix()):
             continue
-        rows = extract_unknown_rows(p)
-        for r in rows:
-            # Expect 6 columns
-            parts = [c.strip() for c in r.split('|') if c.strip()]
-            if len(parts) < 6:
+        for r in index.rows(p, corpus.doc(p)):
+            row = UnknownRow(p, r)
+            if not row.well_formed:
                 msgs.append((str(p), f"FAIL: UNKNOWN row malformed: {r}"))
                 continue
-            impact = parts[-1]
-            if impact.lower().startswith('high'):
+            if row.impact.lower().startswith('high'):
                 msgs.append((str(p), "FAIL: UNKNOWN with High impact present"))
+    index.commit()
     return msgs
 
+def check_unit(unit: Path, corpus: Corpus):
+    return check_unknowns(unit, corpus) if corpus.is_dir(unit) else []
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    messages = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            messages.extend(check_unit(unit, corpus))
+    return messages
+
 def main():
-    for base in (ROOT / 'features',):
-        if not base.exists():
-            continue
-        for fid_dir in base.glob('*'):
-            if not fid_dir.is_dir():
-                continue
-            for path, msg in check_unknowns(fid_dir):
-                print(f"{path}: {msg}")
+    for path, msg in collect():
+        print(f"{path}: {msg}")
 
 if __name__ == '__main__':
     main()
@@ -1,39 +1,55 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 from pathlib import Path
-import re
+
+from corpus import Corpus
+from unknowns_index import open_index
 
 ROOT = Path(__file__).resolve().parents[3]
+ROOTS = (ROOT / 'features', ROOT / 'capsule')
 
-def extract_unknown_rows(md_path: Path):
-    try:
-        text = md_path.read_text(encoding='utf-8')
-    except Exception:
-        return []
-    # Capture the UNKNOWN Summary section content until the next heading or EOF
-    pat = re.compile(r"^## UNKNOWN Summary\n(?P<table>(?:.*\n)+?)^(?:## |\Z)", re.M)
-    m = pat.search(text)
-    if not m:
-        return []
-    rows = [r.strip() for r in m.group('table').splitlines() if '|' in r]
-    # Drop header line if present
-    rows = [r for r in rows if not r.lower().startswith('id |') and r]
-    return rows
+def check_unit(unit: Path, corpus: Corpus):
+    """Return (path, rows) for every document in a unit with UNKNOWN Summary rows.
 
-def main():
-    for base in (ROOT / 'features', ROOT / 'capsule'):
-        if not base.exists():
+    Rows come from the UNKNOWN index (unknowns_index.py), which re-parses only
+    edited documents; the unit's entries are brought up to date, deleted
+    documents included. A run without a result cache parses every document
+    and leaves the index alone.
+    """
+    index = open_index(corpus)
+    found, seen = [], []
+    for p in corpus.capsule(unit).docs:
+        # Skip program reports under capsule/reports
+        if p.as_posix().startswith((ROOT / 'capsule' / 'reports').as_posix()):
             continue
-        for p in base.rglob('*.md'):
-            # Skip program reports under capsule/reports
-            if p.as_posix().startswith((ROOT / 'capsule' / 'reports').as_posix()):
-                continue
-            rows = extract_unknown_rows(p)
-            if rows:
-                print(f"File: {p}")
-                print("ID | Question | Possible Effects | Recommended Actions | Next Step | Impact (High/Moderate/Low)")
-                for r in rows:
-                    print(r)
-                print()
+        seen.append(p)
+        rows = index.rows(p, corpus.doc(p))
+        if rows:
+            found.append((str(p), rows))
+    index.prune(unit, seen)
+    index.commit()
+    return found
+
+def collect(corpus: Corpus | None = None):
+    corpus = corpus or Corpus()
+    found = []
+    for root in ROOTS:
+        for unit in corpus.units(root):
+            found.extend(check_unit(unit, corpus))
+    return found
+
+def format_blocks(found):
+    lines = []
+    for path, rows in found:
+        lines.append(f"File: {path}")
+        lines.append("ID | Question | Possible Effects | Recommended Actions | Next Step | Impact (High/Moderate/Low)")
+        lines.extend(rows)
+        lines.append("")
+    return lines
+
+def main():
+    for line in format_blocks(collect()):
+        print(line)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Synthetic feature capsule generator for benchmarks.
+
+Builds /features/<feature_id>/ capsules from the templates in prompts/: every
+doc_type in prompts/registry.json becomes a document with a valid header and
+the sections (and table columns) its template lists. The contract comes from
+the JSON block in output_contract_template.md, with required keys and
+concurrency_targets filled in, and the tables the validators inspect are
+filled consistently: Checklist ↔ Schema Mapping (fully piped in every second
+capsule, bare header over piped rows in the others), Concurrency Targets/Budget,
+Tests, Acceptance-to-Test Mapping and UNKNOWN Summary (Moderate/Low only, so
+the gates pass and packaging runs to completion).
+
+Sizes:
+  small      every document well under the ~800-word soft limit
+  oversized  every document over the 1600-word hard limit, plus a multi-MB
+             reports/metrics_snapshot.json and a long chaos results report
+
+Usage:
+  gen_capsules.py --root DIR --features N [--size small|oversized] [--prefix bench] [--seed 0]
+
+DIR must be a copy of this repository (the validators resolve paths from
+their own location); run_bench.py prepares one.
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+PROMPTS = ROOT / "prompts"
+
+SIZES = ("small", "oversized")
+UPDATED = "2026-01-01"
+VERSION = "0.1.0"
+UNKNOWN_HEADER = "ID | Question | Possible Effects | Recommended Actions | Next Step | Impact (High/Moderate/Low)"
+CONCURRENCY_HEADER = "Throughput (rps) | Latency p50 (ms) | Latency p95 (ms) | Latency p99 (ms) | Error Budget (%) | Window (days)"
+TESTS_HEADER = "ID | Test Name | Inputs | Expected Result | Linked Schema Key | Status"
+# Not feature documents, or generated separately
+SKIP_DOC_TYPES = {"governance.final_bundle_verifier", "governance.changelog_entry", "planning.output_contract"}
+
+SECTION_RE = re.compile(r"^\s*(?:-\s*)?`?(## [^`]+?)`?\s*$")
+TABLE_RE = re.compile(r"`([^`|]+(?:\|[^`|]+)+)`")
+WORDS = (
+    "queue worker latency budget retry schema contract owner review window metric alert "
+    "throughput tenant partition replay idempotent snapshot release rollout cache shard "
+    "backpressure timeout consumer producer ledger audit policy quota fairness trace"
+).split()
+
+
+def doc_rel(doc_type: str) -> str:
+    """Capsule path for a doc_type: quality.report.X -> reports/X.md, else X.md."""
+    parts = doc_type.split(".")
+    if parts[:2] == ["quality", "report"]:
+        return f"reports/{'.'.join(parts[2:])}.md"
+    return f"{'.'.join(parts[1:])}.md"
+
+
+def template_outline(path: Path) -> list[tuple[str, str | None]]:
+    """Ordered (section heading, table header or None) pairs a template asks for."""
+    sections: list[tuple[str, str | None]] = []
+    seen = set()
+    for ln in path.read_text(encoding="utf-8").splitlines():
+        m = SECTION_RE.match(ln)
+        if m:
+            title = m.group(1).strip()
+            if title in seen:
+                sections.append(None)  # repeated section: ignore its table too
+            else:
+                seen.add(title)
+                sections.append((title, None))
+            continue
+        m = TABLE_RE.search(ln)
+        if m and sections and sections[-1] is not None and sections[-1][1] is None:
+            sections[-1] = (sections[-1][0], m.group(1).strip())
+    return [s for s in sections if s is not None]
+
+
+def load_outlines() -> dict[str, list[tuple[str, str | None]]]:
+    registry = json.loads((PROMPTS / "registry.json").read_text(encoding="utf-8"))
+    return {
+        doc_type: template_outline(ROOT / rel)
+        for doc_type, rel in registry.items()
+        if doc_type not in SKIP_DOC_TYPES
+    }
+
+
+def contract_template() -> dict:
+    text = (PROMPTS / "output_contract_template.md").read_text(encoding="utf-8")
+    m = re.search(r"^```\n(\{.*?\n\})\n```", text, re.M | re.S)
+    return json.loads(m.group(1))
+
+
+def header(feature_id: str, doc_type: str) -> str:
+    return (
+        f"feature_id: {feature_id}\n"
+        f"doc_type: {doc_type}\n"
+        f"schema_ref: urn:automatr:schema:capsule:{feature_id}:{doc_type}:v1@{VERSION}\n"
+        f"version: {VERSION}\n"
+        f"updated: {UPDATED}\n\n"
+    )
+
+
+class Writer:
+    """Deterministic filler text for one feature."""
+
+    def __init__(self, feature_id: str, seed: int, size: str, required: list[str], piped_mapping: bool = False):
+        self.fid = feature_id
+        self.piped_mapping = piped_mapping
+        self.rng = random.Random(f"{seed}:{feature_id}")
+        self.size = size
+        self.required = required
+        self.unknowns = 0
+
+    def sentence(self, n: int = 12) -> str:
+        words = [self.rng.choice(WORDS) for _ in range(n)]
+        return " ".join(words).capitalize() + "."
+
+    def paragraph(self, sentences: int = 3) -> str:
+        return " ".join(self.sentence() for _ in range(sentences))
+
+    def padding(self, words: int) -> str:
+        out, count = [], 0
+        while count < words:
+            s = self.sentence(self.rng.randint(10, 16))
+            out.append(s)
+            count += len(s.split())
+        return "\n".join(" ".join(out[i:i + 6]) for i in range(0, len(out), 6))
+
+    def unknown_rows(self, n: int) -> list[str]:
+        rows = []
+        for _ in range(n):
+            self.unknowns += 1
+            impact = "Moderate" if self.unknowns % 3 else "Low"
+            rows.append(f"U-{self.unknowns:03d} | {self.sentence(6)[:-1]}? | {self.sentence(5)} | "
+                        f"{self.sentence(5)} | {self.sentence(4)} | {impact}")
+        return rows
+
+    def table(self, title: str, columns: str) -> list[str]:
+        req = self.required
+        if title == "## UNKNOWN Summary":
+            return [UNKNOWN_HEADER, *self.unknown_rows(self.rng.randint(1, 3))]
+        if title == "## Checklist ↔ Schema Mapping":
+            # Both table styles FeatureCapsule.mapping_keys reads: a fully piped
+            # Markdown table, or a bare header over rows with edge pipes
+            if self.piped_mapping:
+                return [f"| {columns} |", "| --- | --- |", *(f"| A{i} | {k} |" for i, k in enumerate(req, 1))]
+            return [columns, *(f"| A{i} | {k} |" for i, k in enumerate(req, 1))]
+        if title in ("## Concurrency Targets", "## Concurrency Budget"):
+            return [CONCURRENCY_HEADER, "250 | 20 | 80 | 200 | 0.5 | 30"]
+        if title == "## Tests":
+            return [TESTS_HEADER, "--- | --- | --- | --- | --- | ---",
+                    *(f"T{i} | {k} round trip | valid {k} | {k} persisted | {k} | Pass" for i, k in enumerate(req, 1))]
+        if title == "## Acceptance-to-Test Mapping":
+            return [columns, *(f"A{i} | T{i}" for i in range(1, len(req) + 1))]
+        width = len(columns.split("|"))
+        rows = [" | ".join(self.sentence(3)[:-1] for _ in range(width)) for _ in range(self.rng.randint(2, 4))]
+        return [columns, *rows]
+
+    def section(self, title: str, columns: str | None) -> str:
+        lines = [title]
+        if title == "## Schema Reference":
+            lines.append(f"Contract: urn:automatr:schema:capsule:{self.fid}:planning.output_contract:v1@{VERSION}")
+        elif title == "## Acceptance Criteria":
+            lines.extend(f"{i}. {k} is validated and persisted." for i, k in enumerate(self.required, 1))
+        elif title == "## UNKNOWN Summary" or columns is None:
+            lines.append(self.paragraph(self.rng.randint(1, 3)))
+        if title == "## UNKNOWN Summary" or columns is not None:
+            lines.append("")
+            lines.extend(self.table(title, columns or UNKNOWN_HEADER))
+        return "\n".join(lines) + "\n\n"
+
+    def document(self, doc_type: str, outline: list[tuple[str, str | None]]) -> str:
+        parts = [header(self.fid, doc_type)]
+        for i, (title, columns) in enumerate(outline):
+            parts.append(self.section(title, columns))
+            if i == 0 and self.size == "oversized":
+                parts.append(self.padding(1800) + "\n\n")
+        return "".join(parts)
+
+
+def contract(feature_id: str, base: dict, required: list[str]) -> dict:
+    data = json.loads(json.dumps(base).replace("<feature_id>", feature_id))
+    data["title"] = f"{feature_id} output"
+    data["description"] = f"Synthetic contract for {feature_id}"
+    data["required"] = required
+    data["properties"] = {k: {"type": "string"} for k in required}
+    data["concurrency_targets"] = {
+        "throughput_rps": 250,
+        "latency_ms": {"p50": 20, "p95": 80, "p99": 200},
+        "error_budget_pct": 0.5,
+        "window_days": 30,
+    }
+    return data
+
+
+def metrics_snapshot(writer: Writer, target_bytes: int) -> str:
+    series, size = [], 0
+    while size < target_bytes:
+        point = {"ts": 1767225600 + len(series) * 60, "rps": writer.rng.randint(100, 400),
+                 "p95_ms": writer.rng.randint(40, 120), "errors": writer.rng.randint(0, 5)}
+        series.append(point)
+        size += 64
+    return json.dumps({"feature_id": writer.fid, "series": series}, indent=1) + "\n"
+
+
+def generate_feature(root: Path, feature_id: str, outlines: dict, base_contract: dict,
+                     size: str = "small", seed: int = 0, piped_mapping: bool = False) -> None:
+    rng = random.Random(f"{seed}:{feature_id}:keys")
+    required = sorted(rng.sample(WORDS, rng.randint(2, 5)))
+    writer = Writer(feature_id, seed, size, required, piped_mapping)
+    base = root / "features" / feature_id
+    (base / "reports").mkdir(parents=True, exist_ok=True)
+    for doc_type, outline in outlines.items():
+        (base / doc_rel(doc_type)).write_text(writer.document(doc_type, outline), encoding="utf-8")
+    data = contract(feature_id, base_contract, required)
+    (base / "output_contract.schema.json").write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    (base / "CHANGELOG.md").write_text(
+        f"# CHANGELOG\n\n{UPDATED} | {VERSION} | planning.output_contract: initial contract\n", encoding="utf-8")
+    if size == "oversized":
+        (base / "reports" / "metrics_snapshot.json").write_text(metrics_snapshot(writer, 4 << 20), encoding="utf-8")
+
+
+def feature_ids(count: int, prefix: str = "bench") -> list[str]:
+    width = max(5, len(str(count)))
+    return [f"{prefix}-{i:0{width}d}" for i in range(1, count + 1)]
+
+
+def generate(root: Path, count: int, size: str = "small", prefix: str = "bench", seed: int = 0) -> list[str]:
+    """Write `count` capsules under root/features/ and return their feature_ids."""
+    if size not in SIZES:
+        raise ValueError(f"unknown size: {size}")
+    outlines = load_outlines()
+    base_contract = contract_template()
+    ids = feature_ids(count, prefix)
+    for n, fid in enumerate(ids, 1):
+        # Every second capsule writes its mapping table fully piped
+        generate_feature(root, fid, outlines, base_contract, size, seed, piped_mapping=n % 2 == 0)
+    return ids
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Generate synthetic feature capsules")
+    ap.add_argument("--root", type=Path, required=True, help="Repository copy to write features/ into")
+    ap.add_argument("--features", type=int, default=10)
+    ap.add_argument("--size", choices=SIZES, default="small")
+    ap.add_argument("--prefix", default="bench")
+    ap.add_argument("--seed", type=int, default=0)
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    ids = generate(args.root.resolve(), args.features, args.size, args.prefix, args.seed)
+    print(f"Generated {len(ids)} {args.size} capsules under {args.root / 'features'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the validators and the packager.
+
+For every (feature count, doc size) scenario the harness copies the tooling
+of this repository (capsule/, prompts/, tools/) into a scratch workspace,
+generates synthetic capsules there with gen_capsules.py, and times each
+command in a fresh process:
+
+  validate_all.full.nocache  validate_all.sh --full-tree --no-cache
+  validate_all.full.cold     validate_all.sh --full-tree, result cache emptied first
+  validate_all.full.warm     validate_all.sh --full-tree, result cache filled
+  validate_all.feature       FEATURE_ID=<first feature> validate_all.sh
+  x_check_*.py, x_list_unknowns.py
+                             each check on its own, full tree
+  verify_and_package         tools/final_bundle/verify_and_package.py <first feature>
+  bump_schema_and_sync       bump_schema_and_sync.py --bump patch --run-validate
+
+Commands run in that order because later ones depend on state earlier ones
+leave behind (the cache, creation_run.md). Each is repeated --repeat times;
+the JSON records every wall time, min/median, exit codes and the peak RSS of
+the child process. Exit codes are recorded, not judged: synthetic trees may
+fail gates (the registry check, for one) and that is still a valid timing.
+
+Usage:
+  run_bench.py [--scales 10,1000] [--sizes small,oversized] [--repeat 3]
+               [--only NAME[,NAME]] [--output FILE] [--baseline FILE [--max-regression 1.25]]
+               [--workspace DIR] [--keep]
+
+Results go to tools/bench/results/bench-<UTC timestamp>.json unless --output
+is given. With --baseline, median times are compared per (scenario, command)
+and the exit status is 1 when any ratio exceeds --max-regression.
+"""
+from __future__ import annotations
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gen_capsules import SIZES, generate
+
+ROOT = Path(__file__).resolve().parents[2]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+VALIDATION = Path("capsule/reports/validation")
+CACHE_DIR = VALIDATION / ".run_tmp" / "cache"
+FORMAT = 1
+COPY_DIRS = ("capsule", "prompts", "tools")
+COPY_IGNORE = shutil.ignore_patterns("__pycache__", ".run_tmp", "bench", "final_feature_documents", "features")
+# Environment the validators read; the harness sets what each command needs
+SCRUB_ENV = ("FEATURE_ID", "VALIDATION_FULL_TREE", "DOC_PATH", "STEP")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def utc_iso() -> str:
+    return dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def prepare_workspace(dest: Path) -> None:
+    shutil.rmtree(dest, ignore_errors=True)
+    dest.mkdir(parents=True)
+    for name in COPY_DIRS:
+        shutil.copytree(ROOT / name, dest / name, ignore=COPY_IGNORE)
+
+
+def tree_stats(path: Path) -> tuple[int, int]:
+    files = size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            files += 1
+            size += os.stat(os.path.join(dirpath, name)).st_size
+    return files, size
+
+
+def commands(feature_id: str) -> list[tuple[str, list[str], dict[str, str], Path | None]]:
+    """(name, argv, extra env, directory to empty before each run) in run order.
+
+    argv and the directory are relative to the workspace.
+    """
+    val = VALIDATION
+    full = {"VALIDATION_FULL_TREE": "1"}
+    validate = ["bash", str(val / "validate_all.sh")]
+    cmds = [
+        ("validate_all.full.nocache", [*validate, "--full-tree", "--no-cache"], {}, None),
+        ("validate_all.full.cold", [*validate, "--full-tree"], {}, CACHE_DIR),
+        ("validate_all.full.warm", [*validate, "--full-tree"], {}, None),
+        ("validate_all.feature", validate, {"FEATURE_ID": feature_id}, None),
+    ]
+    for script in sorted((ROOT / val).glob("x_*.py")):
+        cmds.append((script.name, [sys.executable, str(val / script.name)], full, None))
+    cmds.append(("verify_and_package",
+                 [sys.executable, "tools/final_bundle/verify_and_package.py", feature_id], {}, None))
+    cmds.append(("bump_schema_and_sync",
+                 [sys.executable, str(val / "bump_schema_and_sync.py"), "--feature-id", feature_id,
+                  "--bump", "patch", "--run-validate"], {}, None))
+    return cmds
+
+
+def run_once(argv: list[str], cwd: Path, env: dict[str, str], log) -> tuple[float, int, int | None]:
+    """Wall ms, exit code and peak RSS (KiB) of one child process."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        ms = (time.perf_counter() - start) * 1000
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        return ms, proc.returncode, rss
+    code = proc.wait()
+    return (time.perf_counter() - start) * 1000, code, None
+
+
+def run_scenario(workspace: Path, count: int, size: str, repeat: int, only: set[str] | None) -> dict:
+    name = f"{count}-{size}"
+    print(f"== {name}: preparing {workspace}", flush=True)
+    prepare_workspace(workspace)
+    start = time.perf_counter()
+    ids = generate(workspace, count, size)
+    generate_ms = (time.perf_counter() - start) * 1000
+    files, size_bytes = tree_stats(workspace / "features")
+    scenario = {
+        "name": name,
+        "features": count,
+        "doc_size": size,
+        "files": files,
+        "bytes": size_bytes,
+        "generate_ms": round(generate_ms, 3),
+        "commands": [],
+    }
+    base_env = {k: v for k, v in os.environ.items() if k not in SCRUB_ENV}
+    log_dir = workspace / "bench_logs"
+    log_dir.mkdir()
+    for cmd_name, argv, extra, reset in commands(ids[0]):
+        if only and cmd_name not in only:
+            continue
+        env = {**base_env, **extra}
+        runs, codes, rss = [], [], []
+        with (log_dir / f"{cmd_name}.log").open("wb") as log:
+            for _ in range(repeat):
+                if reset is not None:
+                    shutil.rmtree(workspace / reset, ignore_errors=True)
+                ms, code, peak = run_once(argv, workspace, env, log)
+                runs.append(round(ms, 3))
+                codes.append(code)
+                if peak is not None:
+                    rss.append(peak)
+        scenario["commands"].append({
+            "name": cmd_name,
+            "argv": argv,
+            "env": extra,
+            "runs_ms": runs,
+            "min_ms": min(runs),
+            "median_ms": round(statistics.median(runs), 3),
+            "exit_codes": codes,
+            "peak_rss_kb": max(rss) if rss else None,
+        })
+        print(f"{cmd_name:32} median {statistics.median(runs):10.1f} ms  exit {codes[-1]}", flush=True)
+    return scenario
+
+
+def compare(results: dict, baseline: dict, max_ratio: float) -> bool:
+    """Print median ratios against a baseline; False when any exceeds max_ratio."""
+    old = {(s["name"], c["name"]): c["median_ms"] for s in baseline.get("scenarios", []) for c in s["commands"]}
+    ok = True
+    print("== Baseline comparison (median, new / old)")
+    for s in results["scenarios"]:
+        for c in s["commands"]:
+            prev = old.get((s["name"], c["name"]))
+            if not prev:
+                continue
+            ratio = c["median_ms"] / prev
+            flag = ""
+            if ratio > max_ratio:
+                flag = "  REGRESSION"
+                ok = False
+            print(f"{s['name']:18} {c['name']:32} {prev:10.1f} -> {c['median_ms']:10.1f} ms  x{ratio:.2f}{flag}")
+    return ok
+
+
+def csv_list(value: str) -> list[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Time validators and packager on synthetic capsules")
+    ap.add_argument("--scales", type=csv_list, default=["10", "1000"],
+                    help="Comma-separated feature counts (e.g. 10,1000,10000)")
+    ap.add_argument("--sizes", type=csv_list, default=["small"], help=f"Comma-separated doc sizes: {', '.join(SIZES)}")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", type=csv_list, default=None, help="Run only these commands")
+    ap.add_argument("--output", type=Path, default=None)
+    ap.add_argument("--baseline", type=Path, default=None, help="Earlier results JSON to compare against")
+    ap.add_argument("--max-regression", type=float, default=1.25)
+    ap.add_argument("--workspace", type=Path, default=None, help="Scratch directory (default: a temp dir)")
+    ap.add_argument("--keep", action="store_true", help="Keep the workspace after the run")
+    args = ap.parse_args()
+    bad = [s for s in args.sizes if s not in SIZES]
+    if bad:
+        ap.error(f"unknown size(s): {', '.join(bad)}")
+    try:
+        args.scales = [int(s) for s in args.scales]
+    except ValueError:
+        ap.error("--scales takes integers")
+    if args.repeat < 1:
+        ap.error("--repeat must be at least 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    workspace = args.workspace.resolve() if args.workspace else Path(tempfile.mkdtemp(prefix="capsule-bench-"))
+    results = {
+        "format": FORMAT,
+        "created_utc": utc_iso(),
+        "repo_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "scenarios": [],
+    }
+    try:
+        for count in args.scales:
+            for size in args.sizes:
+                results["scenarios"].append(
+                    run_scenario(workspace / f"{count}-{size}", count, size, args.repeat,
+                                 set(args.only) if args.only else None))
+    finally:
+        if not args.keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    out = args.output
+    if out is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        out = RESULTS_DIR / f"bench-{dt.datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json"
+    out.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"Results: {out}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if not compare(results, baseline, args.max_regression):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,47 @@ This file is created for future operational use; the builder does not execute it
 """
 from __future__ import annotations
 import argparse
+import contextlib
 import datetime as dt
+import gzip
 import hashlib
+import io
 import json
+import math
 import os
+import posixpath
 import re
 import shutil
+import stat
 import subprocess
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # not POSIX: no reflinks
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:  # optional: only --archive tar.zst needs it
+    zstandard = None
+
 ROOT = Path(__file__).resolve().parents[2]
+VALIDATION_DIR = ROOT / "capsule" / "reports" / "validation"
+# Document parsing is shared with the validators
+sys.path.insert(0, str(VALIDATION_DIR))
+import feature_results
+import leak_scan
+import result_cache
+from feature_capsule import HEADER_FIELDS, FeatureCapsule
+from leak_scan import scanner
+from run_files import atomic_write, locked
 
 REQUIRED_DOCS = [
     "vision.md",
@@ -35,6 +66,54 @@ REQUIRED_DOCS = [
     "phase_transition.md",
     "CHANGELOG.md",
 ]
+OPTIONAL_REPORTS = ("manual_tests.md", "chaos_results.md", "metrics_snapshot.json")
+# Read/write buffer for copying and hashing bundle files
+COPY_CHUNK = 1 << 20
+# Copies overlap I/O and hashing (hashlib releases the GIL on large buffers);
+# below PARALLEL_BYTES in total, starting threads costs more than it saves
+COPY_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+PARALLEL_BYTES = 4 << 20
+BUNDLE_ROOT = ROOT / "final_feature_documents"
+STORE_DIR = BUNDLE_ROOT / ".objects"
+FICLONE = 0x40049409  # linux/fs.h: share another file's extents (copy-on-write)
+STALE_TMP_SECONDS = 3600
+# Part of every input digest: bumping it, or editing the packager or the
+# parsing it shares, makes existing bundles stale
+INPUTS_FORMAT = 1
+PACKAGER_VERSION = result_cache.source_version(
+    Path(__file__), *(VALIDATION_DIR / m for m in ("leak_scan.py", "feature_capsule.py", "corpus.py", "md_index.py"))
+)
+# Manifest gate -> validator check (see feature_results.py) whose worst
+# severity, from a fresh result, decides it
+GATE_CHECKS = {
+    "identity": "headers",
+    "acceptance_to_required": "acceptance",
+    "concurrency_tuple": "concurrency",
+    "leakage_forbidden": "leaksize",
+    "unknowns_policy": "unknowns_policy",
+}
+SEVERITY_GATE = {"error": "FAIL", "fail": "FAIL", "hard": "FAIL", "warn": "WARN", "soft": "WARN"}
+GATES = ("identity", "acceptance_to_required", "concurrency_tuple", "leakage_forbidden",
+         "size_policy", "unknowns_policy", "nothing_breaks")
+GATE_LABELS = {"leakage_forbidden": "leakage", "size_policy": "size", "unknowns_policy": "unknowns"}
+# Batch runs (--all/--features): resume journal and consolidated summary
+BATCH_DIR = BUNDLE_ROOT / ".batch"
+BATCH_JOURNAL = BATCH_DIR / "journal.jsonl"
+BATCH_REPORT = BATCH_DIR / "summary.md"
+BATCH_JSON = BATCH_DIR / "summary.json"
+ARCHIVE_FORMATS = ("tar.gz", "tar.zst", "zip")
+ARCHIVE_RECORD = "archives.json"
+# Every archive entry gets this mtime (the earliest a zip can store), owner
+# root:root and mode 0644/0755, so equal bundles give equal archives
+ARCHIVE_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+# Brief chunks: tokens are estimated from words as the validator's size
+# policy does (1600 tokens ~ 2133 words)
+TOKENS_PER_WORD = 0.75
+BRIEF_TOKEN_BUDGET = 1600
+LINK_WORDS = 24  # kept free in each chunk for its navigation links
+WORD_RE = re.compile(r"\w+")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
 
 
 def eprint(*a):
@@ -48,11 +127,354 @@ def kebab_ok(s: str) -> bool:
 def sha256_file(path: Path) -> str:
     h = hashlib.sha256()
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b""):
             h.update(chunk)
     return h.hexdigest()
 
 
+def copy_hashed(src: Path, dst: Path) -> str:
+    """shutil.copy2() that returns the SHA-256 of the bytes it copied."""
+    h = hashlib.sha256()
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        for chunk in iter(lambda: fin.read(COPY_CHUNK), b""):
+            h.update(chunk)
+            fout.write(chunk)
+    shutil.copystat(src, dst)
+    return h.hexdigest()
+
+
+class BundleStore:
+    """Content-addressed store of bundle files under final_feature_documents/.objects/.
+
+    Each distinct file is kept once, as <sha[:2]>/<sha> keyed by the SHA-256
+    the manifest records, and bundle directories link to it: a reflink where
+    the filesystem supports one, else a hardlink (objects are read-only, as
+    every bundle sharing them sees any change), else a copy. A file whose
+    digest the caller knows is not read at all when the store has it;
+    others are hashed while they are copied, in one pass, so a new bundle
+    reads each changed file once. gc() drops objects no bundle references.
+    """
+
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = root
+        self.reflinks = fcntl is not None and sys.platform.startswith("linux")
+
+    def object(self, sha: str) -> Path:
+        return self.root / sha[:2] / sha
+
+    def put(self, src: Path, sha: str | None = None) -> str:
+        """Store `src` unless its content is there already; returns its SHA-256.
+
+        With `sha` given and stored, nothing is read. Otherwise `src` is
+        copied to a temporary file while it is hashed, and the copy becomes
+        the object, or is dropped if the store already holds that content.
+        """
+        if sha is not None and self.object(sha).exists():
+            return sha
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / f".{os.getpid()}.{threading.get_ident()}.tmp"
+        copied = copy_hashed(src, tmp)  # differs from `sha` if src changed since it was hashed
+        obj = self.object(copied)
+        if obj.exists():
+            tmp.unlink()
+            return copied
+        tmp.chmod(stat.S_IMODE(tmp.stat().st_mode) & ~0o222)
+        obj.parent.mkdir(exist_ok=True)
+        os.replace(tmp, obj)
+        return copied
+
+    def link(self, sha: str, dst: Path) -> None:
+        """Make `dst` a reflink or hardlink of the object (a copy if neither
+        works); FileNotFoundError if the object is gone."""
+        obj = self.object(sha)
+        if self.reflinks:
+            with obj.open("rb") as fin, dst.open("wb") as fout:
+                try:
+                    fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+                except OSError:
+                    self.reflinks = False  # not supported here; stop trying
+            if self.reflinks:
+                shutil.copystat(obj, dst)
+                dst.chmod(stat.S_IMODE(obj.stat().st_mode) | stat.S_IWUSR)
+                return
+            dst.unlink()
+        try:
+            os.link(obj, dst)
+        except FileNotFoundError:
+            raise
+        except OSError:  # no hardlinks here, e.g. another filesystem
+            shutil.copy2(obj, dst)
+
+    def add_all(self, pairs: list[tuple[Path, Path]], known: dict[Path, str | None] | None = None) -> dict[Path, str]:
+        """Store each (src, dst) pair's source and link it at dst; SHA-256 per dst.
+
+        `known` maps sources to digests the caller already has. Files are
+        hashed and stored on a thread pool when there is enough data, then
+        linked in order: the manifest lists files in directory order, which
+        can follow creation order."""
+        known = known or {}
+        if sum(src.stat().st_size for src, _ in pairs) < PARALLEL_BYTES:
+            digests = [self.put(src, known.get(src)) for src, _ in pairs]
+        else:
+            with ThreadPoolExecutor(max_workers=COPY_WORKERS) as pool:
+                digests = list(pool.map(lambda pair: self.put(pair[0], known.get(pair[0])), pairs))
+        out = {}
+        for (src, dst), sha in zip(pairs, digests):
+            dst.parent.mkdir(exist_ok=True)
+            try:
+                self.link(sha, dst)
+            except FileNotFoundError:  # collected by a concurrent gc
+                sha = self.put(src)
+                self.link(sha, dst)
+            out[dst] = sha
+        return out
+
+    def adopt(self, path: Path, sha: str) -> None:
+        """Replace a file written in a bundle with its stored copy."""
+        self.put(path, sha)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.link")
+        try:
+            self.link(sha, tmp)
+        except FileNotFoundError:
+            return  # collected meanwhile; keep the plain file
+        os.replace(tmp, path)
+
+    def gc(self, bundle_root: Path, dry_run: bool = False) -> tuple[int, int, int]:
+        """Remove objects no bundle manifest lists and no bundle file links to.
+
+        Returns (objects kept, objects removed, bytes freed). A hardlinked
+        object is kept while any bundle links it, so bundles still being
+        assembled keep theirs; temp files left by killed runs go too.
+        """
+        referenced: set[str] = set()
+        for manifest in bundle_root.glob("*/manifest.json"):
+            try:
+                referenced.update(json.loads(manifest.read_text("utf-8")).get("hashes", {}).values())
+            except (OSError, ValueError, AttributeError):
+                continue
+        kept = removed = freed = 0
+        now = time.time()
+        for path in sorted(self.root.glob("*")) if self.root.is_dir() else ():
+            if path.is_file() and path.name.endswith(".tmp") and now - path.stat().st_ctime > STALE_TMP_SECONDS:
+                freed += path.stat().st_size
+                if not dry_run:
+                    path.unlink(missing_ok=True)
+        for obj in sorted(self.root.glob("*/*")) if self.root.is_dir() else ():
+            st = obj.stat()
+            if obj.name in referenced or st.st_nlink > 1:
+                kept += 1
+                continue
+            removed += 1
+            freed += st.st_size
+            if not dry_run:
+                obj.unlink(missing_ok=True)
+        return kept, removed, freed
+
+
+def input_digest(feature_dir: Path, feature_id: str, allow_tokens: bool, chunk_tokens: int,
+                 cache: result_cache.UnitCache | None = None) -> str:
+    """SHA-256 over everything a bundle is built and gated from.
+
+    That is the required docs, every *.md the gates read (feature and
+    reports), the optional reports, the allow-tokens flag, the chunk token
+    budget, the forbidden pattern set and the packager's own source. File
+    hashes come from the validator's cache for the feature when size and
+    mtime still match, so an unchanged feature is mostly not read at all;
+    the cache is not written. Pass `cache` to keep the digests for later
+    lookups.
+    """
+    cache = cache or result_cache.UnitCache(ROOT, feature_dir)
+    h = hashlib.sha256(f"{INPUTS_FORMAT}:{PACKAGER_VERSION}:{feature_id}:{bool(allow_tokens)}:{chunk_tokens}\n".encode())
+    h.update(leak_scan.digest(leak_scan.pattern_sources()).encode())
+    reports_dir = feature_dir / "reports"
+    paths = {feature_dir / rel for rel in REQUIRED_DOCS}
+    paths.update(reports_dir / r for r in ("creation_run.md", *OPTIONAL_REPORTS))
+    paths.update(feature_dir.glob("*.md"))
+    paths.update(reports_dir.glob("*.md"))
+    for path in sorted(paths):
+        sha = cache.digest(path.relative_to(ROOT).as_posix(), path)
+        h.update(f"{path.relative_to(feature_dir).as_posix()}\0{sha or '-'}\n".encode())
+    return h.hexdigest()
+
+
+def find_bundle(feature_id: str, digest: str) -> tuple[Path, dict] | None:
+    """The newest complete bundle of `feature_id` built from inputs with `digest`."""
+    found = []
+    for manifest in BUNDLE_ROOT.glob(f"{feature_id}-*/manifest.json"):
+        try:
+            data = json.loads(manifest.read_text("utf-8"))
+            st = manifest.stat()
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, dict) or data.get("input_digest") != digest or data.get("feature_id") != feature_id:
+            continue
+        if all((manifest.parent / rel).is_file() for rel in data.get("bundle_paths", ())):
+            found.append((st.st_mtime_ns, manifest.parent, data))
+    if not found:
+        return None
+    _, bundle, data = max(found, key=lambda item: item[0])
+    return bundle, data
+
+
+def validator_gates(validation: dict | None) -> dict[str, str]:
+    """Gates decided by a fresh validation result; empty without one.
+
+    Each gate is the worst severity of its validator check in the feature;
+    leakage ignores the size levels of the leakage/size check, which
+    size_policy covers.
+    """
+    if not validation:
+        return {}
+    checks = validation.get("checks", {})
+    out = {}
+    for gate, check in GATE_CHECKS.items():
+        severity = checks.get(check, "ok")
+        if gate == "leakage_forbidden" and severity in ("hard", "soft"):
+            severity = "ok"
+        out[gate] = SEVERITY_GATE.get(severity, "PASS")
+    return out
+
+
+def bundle_gates(validation: dict | None, size_gate: str) -> dict[str, str]:
+    """Manifest gates: the validator's, with size_policy the split rule.
+
+    Without a fresh result every other gate is WARN, nothing_breaks (the
+    validator gate) included: the packager's own checks passed, but the
+    feature was not validated.
+    """
+    validated = validator_gates(validation)
+    gates = {}
+    for gate in GATES:
+        if gate == "size_policy":
+            gates[gate] = size_gate
+        elif gate == "nothing_breaks":
+            gates[gate] = validation["gate"] if validation else "WARN"
+        else:
+            gates[gate] = validated.get(gate, "WARN")
+    return gates
+
+
+def gates_line(gates: dict[str, str]) -> str:
+    """identity=PASS, ..., nothing_breaks=PASS, as SUMMARY.txt and the record show gates."""
+    return ", ".join(f"{GATE_LABELS.get(g, g)}={gates.get(g, 'PASS')}" for g in GATES)
+
+
+def append_record(feature_id: str, commit: str, dest: Path, gates: dict[str, str], final_doc_rel: str, allow_tokens: bool, rationale: str) -> None:
+    rec = ROOT / "capsule" / "reports" / "final_bundle_verification.md"
+    rec.parent.mkdir(parents=True, exist_ok=True)
+    with rec.open("a", encoding="utf-8") as f:
+        f.write(f"{utc_iso()} | feature_id: {feature_id} | commit: {commit} | bundle: /{dest.as_posix()} | gates: {gates_line(gates)} | final: {final_doc_rel} | size_approval: {allow_tokens} | rationale: {rationale}\n")
+
+
+class HashingWriter:
+    """Write-only stream that hashes and counts what passes through to `f`.
+
+    It has no tell() or seek(), so tarfile and zipfile write it in one
+    forward pass (zip entries get data descriptors)."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.sha.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+    def flush(self) -> None:
+        self.f.flush()
+
+
+def archive_entries(bundle: Path) -> list[tuple[str, Path]]:
+    """(archive name, path) of every directory and file in the bundle, sorted by name."""
+    entries = []
+    for path in bundle.rglob("*"):
+        rel = path.relative_to(bundle).as_posix()
+        if rel != ARCHIVE_RECORD:
+            entries.append((f"{bundle.name}/{rel}", path))
+    entries.append((bundle.name, bundle))
+    return sorted(entries)
+
+
+def write_tar(out, entries: list[tuple[str, Path]]) -> None:
+    with tarfile.open(fileobj=out, mode="w|", format=tarfile.GNU_FORMAT) as tar:
+        for name, path in entries:
+            info = tarfile.TarInfo(name)
+            info.mtime = ARCHIVE_EPOCH
+            if path.is_dir():
+                info.type, info.mode = tarfile.DIRTYPE, 0o755
+                tar.addfile(info)
+                continue
+            info.mode, info.size = 0o644, path.stat().st_size
+            with path.open("rb") as f:
+                tar.addfile(info, f)
+
+
+def write_zip(out, entries: list[tuple[str, Path]]) -> None:
+    stamp = time.gmtime(ARCHIVE_EPOCH)[:6]
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, path in entries:
+            is_dir = path.is_dir()
+            info = zipfile.ZipInfo(name + "/" if is_dir else name, stamp)
+            info.create_system = 3  # unix, so external_attr carries the mode
+            info.external_attr = ((stat.S_IFDIR | 0o755) << 16 | 0x10) if is_dir else (stat.S_IFREG | 0o644) << 16
+            if is_dir:
+                zf.writestr(info, b"")
+                continue
+            info.compress_type, info.file_size = zipfile.ZIP_DEFLATED, path.stat().st_size
+            with path.open("rb") as fin, zf.open(info, "w") as fout:
+                shutil.copyfileobj(fin, fout, COPY_CHUNK)
+
+
+def archive_bundle(bundle: Path, fmt: str) -> dict:
+    """Write the bundle as final_feature_documents/<bundle>.<fmt> in one pass.
+
+    Entries are sorted by name with normalised mtime, owner and mode, and
+    compression carries no timestamp or file name, so the same bundle
+    content always gives the same bytes. The archive's SHA-256 is computed
+    while it is written and recorded in <bundle>/archives.json next to the
+    manifest (the manifest itself is inside the archive). An archive that
+    record already lists is kept as it is.
+    """
+    target = bundle.with_name(f"{bundle.name}.{fmt}")
+    record_path = bundle / ARCHIVE_RECORD
+    try:
+        records = json.loads(record_path.read_text("utf-8"))
+    except (OSError, ValueError):
+        records = {}
+    known = records.get(fmt)
+    if known and target.is_file() and target.stat().st_size == known.get("bytes"):
+        return known
+    entries = archive_entries(bundle)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        out = HashingWriter(f)
+        if fmt == "zip":
+            write_zip(out, entries)
+        elif fmt == "tar.gz":
+            # No file name and a fixed mtime in the gzip header
+            with gzip.GzipFile(filename="", mode="wb", fileobj=out, compresslevel=9, mtime=0) as gz:
+                write_tar(gz, entries)
+        else:
+            with zstandard.ZstdCompressor(level=19).stream_writer(out, closefd=False) as zst:
+                write_tar(zst, entries)
+    os.replace(tmp, target)
+    records[fmt] = {
+        "archive": target.name,
+        "format": fmt,
+        "sha256": out.sha.hexdigest(),
+        "bytes": out.size,
+        "entries": len(entries),
+    }
+    record_path.write_text(json.dumps(records, indent=2), encoding="utf-8")
+    return records[fmt]
+
+
+def print_archive(record: dict) -> None:
+    print(f"BUNDLE ARCHIVE: /final_feature_documents/{record['archive']} sha256={record['sha256']}")
+
+
 def git_commit() -> str:
     try:
         return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT).decode().strip()
@@ -71,14 +493,20 @@ def utc_iso() -> str:
     return dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def run_validator(feature_id: str) -> str:
+def run_validator(*feature_ids: str) -> str:
+    """Validate one feature (FEATURE_ID) or several in one batch run."""
     val = ROOT / "capsule" / "reports" / "validation" / "validate_all.sh"
     if not val.exists():
         return ""
     env = os.environ.copy()
-    env["FEATURE_ID"] = feature_id
+    args = []
+    if len(feature_ids) == 1:
+        env["FEATURE_ID"] = feature_ids[0]
+    else:
+        env.pop("FEATURE_ID", None)
+        args = list(feature_ids)
     try:
-        out = subprocess.check_output(["bash", str(val)], env=env, cwd=ROOT, stderr=subprocess.STDOUT)
+        out = subprocess.check_output(["bash", str(val), *args], env=env, cwd=ROOT, stderr=subprocess.STDOUT)
         return out.decode("utf-8", errors="replace")
     except subprocess.CalledProcessError as e:
         return e.output.decode("utf-8", errors="replace")
@@ -86,9 +514,30 @@ def run_validator(feature_id: str) -> str:
 
 def parse_args() -> argparse.Namespace:
     ap = argparse.ArgumentParser()
-    ap.add_argument("feature_id")
+    ap.add_argument("feature_id", nargs="?")
+    ap.add_argument("--all", action="store_true", help="package every feature under features/")
+    ap.add_argument("--features", help="package these features (comma-separated)")
+    ap.add_argument("--jobs", type=int, default=0, help="worker processes for --all/--features (default: CPU count)")
     ap.add_argument("--allow-gt-1600-tokens", dest="allow_tokens", choices=["yes", "no"], default="no")
-    return ap.parse_args()
+    ap.add_argument("--chunk-tokens", type=int, default=BRIEF_TOKEN_BUDGET,
+                    help=f"token budget per chunk of a split brief (default {BRIEF_TOKEN_BUDGET})")
+    ap.add_argument("--archive", choices=ARCHIVE_FORMATS, help="also write the bundle as one reproducible archive")
+    ap.add_argument("--force", action="store_true", help="package even if a bundle of the same inputs exists")
+    ap.add_argument("--gc", action="store_true", help="remove store objects no bundle references, then exit")
+    ap.add_argument("--dry-run", action="store_true", help="with --gc, only report what would be removed")
+    ns = ap.parse_args()
+    batch = ns.all or ns.features is not None
+    if ns.feature_id is not None and batch:
+        ap.error("feature_id cannot be combined with --all/--features")
+    if ns.all and ns.features is not None:
+        ap.error("--all and --features are mutually exclusive")
+    if ns.features is not None and not any(f.strip() for f in ns.features.split(",")):
+        ap.error("--features needs at least one feature_id")
+    if ns.chunk_tokens < 1:
+        ap.error("--chunk-tokens must be positive")
+    if ns.feature_id is None and not batch and not ns.gc:
+        ap.error("the following arguments are required: feature_id")
+    return ns
 
 
 def stop(reason: str, need: str, paths: str):
@@ -97,139 +546,243 @@ def stop(reason: str, need: str, paths: str):
     print(f"PATHS: {paths}")
 
 
-def verify_headers(feature_dir: Path, feature_id: str) -> bool:
+def verify_headers(cap: FeatureCapsule, feature_id: str) -> bool:
     urn_re = re.compile(rf"^urn:automatr:schema:capsule:{re.escape(feature_id)}:[a-z0-9_.-]+:v\d+@[^\s]+$")
-    ok = True
-    for md in list(feature_dir.glob("*.md")) + list((feature_dir / "reports").glob("*.md")):
+    for md in cap.top_docs:
         try:
-            head = md.read_text(encoding="utf-8").splitlines()[:20]
+            header = cap.header(md)
         except Exception:
             continue
-        if not any(l.startswith("feature_id:") for l in head):
+        if "feature_id" not in header:
             continue
-        keys = {k.split(":", 1)[0].strip() for k in head if ":" in k}
-        if not {"feature_id", "doc_type", "schema_ref", "version", "updated"}.issubset(keys):
-            ok = False
-            break
-        sref = next((l.split(":", 1)[1].strip() for l in head if l.startswith("schema_ref:")), "")
-        if not urn_re.match(sref):
-            ok = False
-            break
-    return ok
-
-
-def acceptance_vs_required(feature_dir: Path) -> bool:
-    schema = json.loads((feature_dir / "output_contract.schema.json").read_text("utf-8"))
-    req = schema.get("required") or []
-    if not req:
-        return True
-    ic = (feature_dir / "intent_card.md").read_text("utf-8", errors="replace")
-    # Find mapping section
-    mapped = set()
-    in_map = False
-    for ln in ic.splitlines():
-        if ln.strip().lower().startswith("## checklist") and "schema" in ln.lower():
-            in_map = True
-            continue
-        if in_map and ln.startswith("## "):
-            break
-        if in_map and "|" in ln and not ln.strip().lower().startswith("id |"):
-            cols = [c.strip(" `") for c in ln.split("|")]
-            if len(cols) >= 3:
-                mapped.add(cols[2])
-    return all(k in mapped for k in req)
+        if not all(k in header for k in HEADER_FIELDS) or not urn_re.match(header["schema_ref"]):
+            return False
+    return True
+
 
+def acceptance_vs_required(cap: FeatureCapsule) -> bool:
+    """Same checklist ↔ schema mapping as x_check_acceptance_schema.py."""
+    return all(k in cap.mapping_keys for k in cap.required_keys)
 
-def concurrency_tuple_ok(feature_dir: Path) -> bool:
-    if "## Concurrency Targets" not in (feature_dir / "intent_card.md").read_text("utf-8", errors="replace"):
+
+def concurrency_tuple_ok(cap: FeatureCapsule) -> bool:
+    if "## Concurrency Targets" not in cap.text("intent_card.md"):
         return False
-    if "## Concurrency Budget" not in (feature_dir / "action_budget.md").read_text("utf-8", errors="replace"):
+    if "## Concurrency Budget" not in cap.text("action_budget.md"):
         return False
-    schema = json.loads((feature_dir / "output_contract.schema.json").read_text("utf-8"))
-    ct = schema.get("concurrency_targets") or {}
+    ct = cap.concurrency_targets or {}
     return all(k in ct for k in ("throughput_rps", "latency_ms", "error_budget_pct", "window_days")) and all(
         k in ct.get("latency_ms", {}) for k in ("p50", "p95", "p99")
     )
 
 
-def leakage_ok(feature_dir: Path) -> bool:
-    pats = [re.compile(p, re.I) for p in [
-        r"\bYou are an? (autonomous|AI|model)\b",
-        r"^Purpose$",
-        r"^Template$",
-        r"You are generating scaffolding documents only",
-    ]]
-    for md in list(feature_dir.glob("*.md")) + list((feature_dir / "reports").glob("*.md")):
-        text = md.read_text("utf-8", errors="replace")
-        if any(p.search(text) for p in pats):
-            return False
-    return True
+def leakage_ok(cap: FeatureCapsule) -> tuple[bool, list[str]]:
+    """Same forbidden patterns as x_check_leak_and_size.py, one pass per document."""
+    leaks = scanner()
+    hits: list[str] = []
+    for md in cap.top_docs:
+        hits.extend(f"{md}:{line}" for line in sorted({h.line for h in leaks.hits(cap.text(md.relative_to(cap.base).as_posix()))}))
+    return (len(hits) == 0, hits)
 
 
-def unknowns_policy_ok(feature_dir: Path) -> tuple[bool, list[dict]]:
-    high_rows: list[dict] = []
-    for md in list(feature_dir.glob("*.md")) + list((feature_dir / "reports").glob("*.md")):
-        text = md.read_text("utf-8", errors="replace")
-        m = re.search(r"^## UNKNOWN Summary\n((?:.*\n)+?)(?:^## |\Z)", text, re.M)
-        if not m:
-            continue
-        for row in m.group(1).splitlines():
-            if "|" not in row or row.strip().lower().startswith("id |"):
-                continue
-            cols = [c.strip() for c in row.split("|") if c.strip()]
-            if len(cols) >= 6 and cols[-1].lower().startswith("high"):
-                high_rows.append({"doc": str(md), "row": row})
+def unknowns_policy_ok(cap: FeatureCapsule) -> tuple[bool, list]:
+    top = set(cap.top_docs)
+    high_rows = [r for r in cap.unknown_rows if r.path in top and r.well_formed and r.impact.lower().startswith("high")]
     return (len(high_rows) == 0, high_rows)
 
 
-def build_bundle(feature_id: str, allow_tokens: bool) -> None:
+def estimate_tokens(words: int) -> int:
+    return math.ceil(words * TOKENS_PER_WORD)
+
+
+def count_words(text: str) -> int:
+    return len(WORD_RE.findall(text))
+
+
+def md_sections(lines):
+    """(lines, words) per section of a Markdown stream; a section starts at a heading outside code fences."""
+    block: list[str] = []
+    words = 0
+    fenced = False
+    for line in lines:
+        if FENCE_RE.match(line):
+            fenced = not fenced
+        elif not fenced and block and HEADING_RE.match(line):
+            yield block, words
+            block, words = [], 0
+        block.append(line)
+        words += count_words(line)
+    if block:
+        yield block, words
+
+
+def section_pieces(block: list[str], words: int, limit: int):
+    """A section in runs of at most `limit` words.
+
+    Whole when it fits; else cut after blank lines outside code fences, so
+    tables, lists and UNKNOWN rows stay together; a paragraph still too
+    long is cut between lines, and a single line between words.
+    """
+    if words <= limit:
+        yield block, words
+        return
+    para: list[str] = []
+    para_words = 0
+    fenced = False
+    for line in block:
+        if FENCE_RE.match(line):
+            fenced = not fenced
+        para.append(line)
+        para_words += count_words(line)
+        if not fenced and not line.strip():
+            yield from line_pieces(para, para_words, limit)
+            para, para_words = [], 0
+    if para:
+        yield from line_pieces(para, para_words, limit)
+
+
+def line_pieces(lines: list[str], words: int, limit: int):
+    if words <= limit:
+        yield lines, words
+        return
+    for line in lines:
+        n = count_words(line)
+        while n > limit:
+            cut = list(WORD_RE.finditer(line))[limit].start()
+            yield [line[:cut].rstrip() + "\n"], limit
+            line, n = line[cut:], n - limit
+        yield [line], n
+
+
+def pack_chunks(lines, limit: int):
+    """(lines, words) per chunk of at most `limit` words, streamed.
+
+    Sections are packed whole: one that does not fit the current chunk
+    starts the next, and only a section larger than a chunk is cut.
+    """
+    chunk: list[str] = []
+    words = 0
+    for block, block_words in md_sections(lines):
+        for piece, piece_words in section_pieces(block, block_words, limit):
+            if chunk and words + piece_words > limit:
+                yield chunk, words
+                chunk, words = [], 0
+            chunk += piece
+            words += piece_words
+    if chunk:
+        yield chunk, words
+
+
+def chunk_brief(bundle: Path, final_doc_rel: str, budget: int | None) -> list[dict]:
+    """Split the bundle's brief on section boundaries into chunks within `budget` tokens.
+
+    The brief keeps the first chunk, header included; the others go to
+    appendix-01.md, appendix-02.md, ... at the bundle root. Each chunk
+    links back to the brief and on to the next one. The brief is streamed
+    twice (count, then split) and chunks are written as they fill. A brief
+    within the budget, or any brief when `budget` is None, is left as it is.
+    Returns the manifest's chunk list with estimated tokens, links included.
+    """
+    brief = bundle / final_doc_rel
+    with brief.open(encoding="utf-8", errors="replace") as f:
+        words = sum(count_words(line) for line in f)
+    if budget is None or estimate_tokens(words) <= budget:
+        return [{"path": final_doc_rel, "tokens": estimate_tokens(words)}]
+    chunks: list[dict] = []
+
+    def write(lines: list[str], words: int, last: bool) -> None:
+        rel = f"appendix-{len(chunks):02d}.md" if chunks else final_doc_rel
+        here = posixpath.dirname(rel) or "."
+        links = []
+        if chunks:
+            links.append(f"[Back to final brief]({posixpath.relpath(final_doc_rel, here)})")
+        if not last:
+            nxt = f"appendix-{len(chunks) + 1:02d}.md"
+            links.append(f"[Continued in {nxt}]({posixpath.relpath(nxt, here)})")
+        footer = "\n".join(links)
+        (bundle / rel).write_text("".join(lines).rstrip("\n") + "\n\n" + footer + "\n", encoding="utf-8")
+        chunks.append({"path": rel, "tokens": estimate_tokens(words + count_words(footer))})
+
+    # The brief may be linked to the store: read it under another name, write a new file
+    src = brief.with_name(brief.name + ".src")
+    brief.rename(src)
+    limit = max(1, math.floor(budget / TOKENS_PER_WORD) - LINK_WORDS)
+    with src.open(encoding="utf-8", errors="replace") as f:
+        held = None
+        for chunk in pack_chunks(f, limit):
+            if held is not None:
+                write(*held, last=False)
+            held = chunk
+        write(*held, last=True)
+    src.unlink()
+    return chunks
+
+
+def build_bundle(feature_id: str, allow_tokens: bool, chunk_tokens: int) -> Path:
     feature_dir = ROOT / "features" / feature_id
     reports_dir = feature_dir / "reports"
-    # Gates
-    if not verify_headers(feature_dir, feature_id):
+    # Every gate and the brief read the capsule through one parse
+    cap = FeatureCapsule(feature_dir)
+    # Gates: a fresh validator result decides those it covers, and only the
+    # rest are checked here
+    validation = feature_results.load_fresh(feature_id)
+    validated = validator_gates(validation)
+
+    def passed(gate: str, check) -> bool:
+        return validated[gate] == "PASS" if gate in validated else check()
+
+    if not passed("identity", lambda: verify_headers(cap, feature_id)):
         stop("Missing/invalid headers or schema_ref URN", "Fix header fields and canonical URN in all feature docs", f"{feature_dir}/*.md {reports_dir}/*.md")
         raise SystemExit(5)
-    if not acceptance_vs_required(feature_dir):
+    if not passed("acceptance_to_required", lambda: acceptance_vs_required(cap)):
         stop("Acceptance↔required mapping incomplete", "Ensure all required keys are mapped in intent_card.md", f"{feature_dir}/intent_card.md | {feature_dir}/output_contract.schema.json")
         raise SystemExit(6)
-    if not concurrency_tuple_ok(feature_dir):
+    if not passed("concurrency_tuple", lambda: concurrency_tuple_ok(cap)):
         stop("Missing/inconsistent concurrency tuple", "Add Concurrency Targets/Budget sections and concurrency_targets in schema", f"{feature_dir}/intent_card.md | {feature_dir}/action_budget.md | {feature_dir}/output_contract.schema.json")
         raise SystemExit(7)
-    if not leakage_ok(feature_dir):
-        stop("Prompt leakage/forbidden patterns detected", "Remove meta-prompt text from generated docs", f"{feature_dir}/*.md {reports_dir}/*.md")
+    if "leakage_forbidden" in validated:
+        # The validator's summary lists the documents and lines
+        ok_leakage, leaks = validated["leakage_forbidden"] == "PASS", [str(reports_dir / "validation_summary.md")]
+    else:
+        ok_leakage, leaks = leakage_ok(cap)
+    if not ok_leakage:
+        stop("Prompt leakage/forbidden patterns detected", "Remove meta-prompt text from generated docs", "\n".join(leaks))
         raise SystemExit(8)
-    ok_unknowns, highs = unknowns_policy_ok(feature_dir)
+    # Always the packager's own check: the validator's also fails malformed
+    # UNKNOWN rows, the creation log's step rows among them, and packaging
+    # has only ever refused High-impact ones
+    ok_unknowns, highs = unknowns_policy_ok(cap)
     if not ok_unknowns:
-        rows = "\n".join(f"{r['doc']}: {r['row']}" for r in highs)
+        rows = "\n".join(f"{r.path}: {r.text}" for r in highs)
         stop("High-impact UNKNOWNs present", "Resolve or downgrade High-impact unknowns", rows)
         raise SystemExit(9)
 
     # Bundle
+    # Source digests are kept, so the store does not read stored content again
+    hashed = result_cache.UnitCache(ROOT, feature_dir)
+    digest = input_digest(feature_dir, feature_id, allow_tokens, chunk_tokens, hashed)
     commit = git_commit()
     date_str = utc_date()
-    schema = json.loads((feature_dir / "output_contract.schema.json").read_text("utf-8"))
+    schema = cap.schema
     schema_ver = schema.get("version", "0.0.0")
-    bundle_root = ROOT / "final_feature_documents"
     bundle_name = f"{feature_id}-{schema_ver}-{date_str}-{commit}"
-    dest = bundle_root / bundle_name
-    tmp = bundle_root / f".tmp.{bundle_name}.{os.getpid()}"
+    dest = BUNDLE_ROOT / bundle_name
+    tmp = BUNDLE_ROOT / f".tmp.{bundle_name}.{os.getpid()}"
     shutil.rmtree(tmp, ignore_errors=True)
     tmp.mkdir(parents=True, exist_ok=True)
 
-    # Copy docs
-    for rel in REQUIRED_DOCS:
-        shutil.copy2(feature_dir / rel, tmp / rel)
-    (tmp / "reports").mkdir(parents=True, exist_ok=True)
-    shutil.copy2(reports_dir / "creation_run.md", tmp / "reports" / "creation_run.md")
-    for opt in ("manual_tests.md", "chaos_results.md", "metrics_snapshot.json"):
-        if (reports_dir / opt).exists():
-            shutil.copy2(reports_dir / opt, tmp / "reports" / opt)
+    # Link docs from the store, which copies only content it lacks
+    store = BundleStore()
+    pairs = [(feature_dir / rel, tmp / rel) for rel in REQUIRED_DOCS]
+    pairs += [(reports_dir / r, tmp / "reports" / r) for r in ("creation_run.md", *OPTIONAL_REPORTS)
+              if r == "creation_run.md" or (reports_dir / r).exists()]
     # Implementation brief
     final_doc_rel: str
     if (reports_dir / "implementation_brief.md").exists():
-        shutil.copy2(reports_dir / "implementation_brief.md", tmp / "reports" / "implementation_brief.md")
+        pairs.append((reports_dir / "implementation_brief.md", tmp / "reports" / "implementation_brief.md"))
         final_doc_rel = "reports/implementation_brief.md"
-    else:
+    copied = store.add_all(pairs, {src: hashed.digest(src.relative_to(ROOT).as_posix(), src) for src, _ in pairs})
+    if not (reports_dir / "implementation_brief.md").exists():
         final_doc_rel = "final_implementation_brief.md"
         with (tmp / final_doc_rel).open("w", encoding="utf-8") as f:
             f.write(f"feature_id: {feature_id}\n")
@@ -238,71 +791,77 @@ def build_bundle(feature_id: str, allow_tokens: bool) -> None:
             f.write("version: 1.0.0\n")
             f.write(f"updated: {dt.date.today().isoformat()}\n\n")
             f.write("## Goal\n\n")
-            f.write((feature_dir / "vision.md").read_text("utf-8", errors="replace"))
+            f.write(cap.text("vision.md"))
             f.write("\n\n## Context\n\n")
-            f.write((feature_dir / "exploration.md").read_text("utf-8", errors="replace"))
+            f.write(cap.text("exploration.md"))
             f.write("\n\n## Actions\n\n")
-            f.write((feature_dir / "action_budget.md").read_text("utf-8", errors="replace"))
+            f.write(cap.text("action_budget.md"))
             f.write("\n\n## Constraints\n\n")
-            f.write((feature_dir / "observability_slos.md").read_text("utf-8", errors="replace"))
+            f.write(cap.text("observability_slos.md"))
             f.write("\n\n## Contract Excerpt\n\n")
             f.write(json.dumps({"required": schema.get("required"), "properties": list((schema.get("properties") or {}).keys())}, indent=2))
             f.write("\n\n## Test Plan\n\n")
-            f.write((feature_dir / "manual_tests.md").read_text("utf-8", errors="replace"))
+            f.write(cap.text("manual_tests.md"))
             f.write("\n\n## Risks/Unknowns\n\n")
             for src in ("exploration.md", "intent_card.md"):
-                txt = (feature_dir / src).read_text("utf-8", errors="replace")
-                m = re.search(r"^## UNKNOWN Summary\n((?:.*\n)+?)(?:^## |\Z)", txt, re.M)
-                if m:
+                section = cap.doc(src).index.section("UNKNOWN Summary")
+                if section is not None:
                     f.write("## UNKNOWN Summary\n")
-                    f.write(m.group(1))
-
-    # Size policy: split if needed
-    brief = tmp / final_doc_rel
-    words = len(re.findall(r"\w+", brief.read_text("utf-8", errors="replace")))
-    if words > 2133 and not allow_tokens:
-        appx = tmp / "appendix.md"
-        text = brief.read_text("utf-8", errors="replace")
-        mid = len(text) // 2
-        brief.write_text(text[:mid] + "\n\n[See appendix](appendix.md)\n", encoding="utf-8")
-        appx.write_text(text[mid:] + f"\n\n[Back to final brief]({final_doc_rel})\n", encoding="utf-8")
+                    f.write(section.text)
+
+    # Size policy: chunk if needed
+    chunks = chunk_brief(tmp, final_doc_rel, None if allow_tokens else chunk_tokens)
+    if len(chunks) > 1:
+        copied.pop(tmp / final_doc_rel, None)
 
     # Manifest and summary
+    gates = bundle_gates(validation, "PASS" if len(chunks) == 1 else "WARN")
+    if validation is None:
+        verdict = "no fresh result"
+    elif validation.get("stop_reason"):
+        verdict = f"{validation['gate']} ({validation['stop_reason']})"
+    else:
+        verdict = validation["gate"]
     manifest = tmp / "manifest.json"
     summary = tmp / "SUMMARY.txt"
     bundle_paths = []
     hashes = {}
+    written = {}
     for path in tmp.rglob("*"):
         if path.is_file():
             rel = str(path.relative_to(tmp))
             bundle_paths.append(rel)
-            hashes[rel] = sha256_file(path)
+            # Only files written here, not linked, are read again
+            if path in copied:
+                hashes[rel] = copied[path]
+            else:
+                hashes[rel] = written[path] = sha256_file(path)
+    for path, sha in written.items():
+        store.adopt(path, sha)
     manifest.write_text(json.dumps({
         "feature_id": feature_id,
         "schema_ref": schema.get("$id", ""),
         "schema_semver": schema_ver,
         "repo_commit": commit,
         "created_utc": utc_iso(),
+        "input_digest": digest,
         "source_paths": [str((feature_dir / d)) for d in REQUIRED_DOCS] + [str(reports_dir / r) for r in ("creation_run.md", "manual_tests.md", "chaos_results.md", "metrics_snapshot.json") if (reports_dir / r).exists()] + [str(feature_dir / final_doc_rel)],
         "bundle_paths": bundle_paths,
         "hashes": hashes,
-        "gates": {
-            "identity": "PASS",
-            "acceptance_to_required": "PASS",
-            "concurrency_tuple": "PASS",
-            "leakage_forbidden": "PASS",
-            "size_policy": "PASS" if (words <= 2133 or allow_tokens) else "WARN",
-            "unknowns_policy": "PASS",
-            "nothing_breaks": "PASS",
-        },
+        "gates": gates,
+        "validator_gate": gates["nothing_breaks"],
         "approvals": {"allow_gt_1600_tokens": bool(allow_tokens)},
         "unknowns_summary": [],
         "final_doc": final_doc_rel,
+        "brief_token_budget": chunk_tokens,
+        "brief_chunks": chunks,
         "notes": ""
     }, indent=2), encoding="utf-8")
     summary.write_text(
         f"Final doc: {final_doc_rel}\nCommit: {commit}\nSchema: {schema_ver}\n"
-        f"Gates: identity=PASS, acceptance_to_required=PASS, concurrency_tuple=PASS, leakage=PASS, size={'PASS' if (words<=2133 or allow_tokens) else 'WARN'}, unknowns=PASS, nothing_breaks=PASS\n"
+        f"Gates: {gates_line(gates)}\n"
+        f"Validator: {verdict}\n"
+        f"Brief: {len(chunks)} chunk(s), ~{max(c['tokens'] for c in chunks)} tokens max\n"
         "Unknowns: High=0, Moderate/Low=(see docs)\nNext: Hand this folder to your LLM/codegen\n",
         encoding="utf-8",
     )
@@ -313,17 +872,14 @@ def build_bundle(feature_id: str, allow_tokens: bool) -> None:
     tmp.rename(dest)
 
     # Append verification record
-    rec = ROOT / "capsule" / "reports" / "final_bundle_verification.md"
-    rec.parent.mkdir(parents=True, exist_ok=True)
-    with rec.open("a", encoding="utf-8") as f:
-        f.write(f"{utc_iso()} | feature_id: {feature_id} | commit: {commit} | bundle: /{dest.as_posix()} | gates: identity=PASS, acceptance_to_required=PASS, concurrency_tuple=PASS, leakage=PASS, size={'PASS' if (words<=2133 or allow_tokens) else 'WARN'}, unknowns=PASS, nothing_breaks=PASS | final: {final_doc_rel} | size_approval: {allow_tokens} | rationale: packaged\n")
+    append_record(feature_id, commit, dest, gates, final_doc_rel, allow_tokens, "packaged")
 
     print(f"FINAL BUNDLE CREATED: /final_feature_documents/{bundle_name}/final_doc => {final_doc_rel}")
+    return dest
 
 
-def main():
-    ns = parse_args()
-    feature_id = ns.feature_id
+def open_feature(feature_id: str) -> Path:
+    """The feature's directory, or STOP when the id or a required path is bad."""
     if not kebab_ok(feature_id):
         stop("Missing or invalid feature_id", 'Provide a kebab-case feature_id (e.g., "user-profile-sync")', f"/features/{feature_id}/")
         raise SystemExit(3)
@@ -340,10 +896,184 @@ def main():
     if missing:
         stop("Missing required files/directories", "Create the missing paths and try again", "\n".join(missing))
         raise SystemExit(4)
+    return feature_dir
+
+
+def reuse_bundle(feature_id: str, allow_tokens: bool, chunk_tokens: int, archive: str | None, force: bool) -> Path | None:
+    """The existing bundle built from the feature's current inputs, if any.
+
+    Checks the feature's paths first; with `force` that is all it does."""
+    feature_dir = open_feature(feature_id)
+    if force:
+        return None
+    found = find_bundle(feature_id, input_digest(feature_dir, feature_id, allow_tokens, chunk_tokens))
+    if found is None:
+        return None
+    dest, manifest = found
+    append_record(feature_id, manifest.get("repo_commit", "unknown"), dest, manifest.get("gates", {}), manifest.get("final_doc", ""), allow_tokens, "unchanged inputs")
+    print(f"FINAL BUNDLE UNCHANGED: /final_feature_documents/{dest.name}/final_doc => {manifest.get('final_doc', '')}")
+    if archive:
+        print_archive(archive_bundle(dest, archive))
+    return dest
+
+
+def package(feature_id: str, allow_tokens: bool, chunk_tokens: int, archive: str | None) -> Path:
+    dest = build_bundle(feature_id, allow_tokens, chunk_tokens)
+    if archive:
+        print_archive(archive_bundle(dest, archive))
+    return dest
+
+
+def captured(fn, *args) -> dict:
+    """fn(*args) with its output captured and STOP exits turned into a result."""
+    buf = io.StringIO()
+    result = {"code": 0, "bundle": None}
+    with contextlib.redirect_stdout(buf):
+        try:
+            dest = fn(*args)
+            result["bundle"] = dest.name if dest is not None else None
+        except SystemExit as e:
+            result["code"] = e.code if isinstance(e.code, int) else 1
+    result["output"] = buf.getvalue()
+    result["stop_reason"] = next((l[len("STOP: "):] for l in result["output"].splitlines() if l.startswith("STOP: ")), "")
+    return result
+
+
+def batch_package(feature_id: str, allow_tokens: bool, chunk_tokens: int, archive: str | None) -> dict:
+    """Pool entry point: gates and bundle for one feature, output captured."""
+    return {"feature_id": feature_id, **captured(package, feature_id, allow_tokens, chunk_tokens, archive)}
+
+
+def batch_features(ns: argparse.Namespace) -> list[str]:
+    if ns.all:
+        return sorted(p.name for p in (ROOT / "features").iterdir() if p.is_dir() and not p.name.startswith("."))
+    return list(dict.fromkeys(f.strip() for f in ns.features.split(",") if f.strip()))
+
+
+def resume_point(journal, key: dict) -> dict[str, dict]:
+    """Results already journaled by an unfinished batch with the same `key`.
+
+    Otherwise the journal is emptied and a new batch is started in it."""
+    journal.seek(0)
+    records = []
+    for line in journal.read().decode("utf-8", errors="replace").splitlines():
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # torn by a kill mid-write
+    start = max((i for i, r in enumerate(records) if r.get("op") == "start"), default=None)
+    if start is not None and records[start].get("key") == key and not any(r.get("op") == "end" for r in records[start:]):
+        return {r["feature_id"]: r for r in records[start:] if r.get("op") == "feature"}
+    journal.truncate(0)
+    journal_append(journal, {"op": "start", "key": key, "started_utc": utc_iso()})
+    return {}
+
+
+def journal_append(journal, record: dict) -> None:
+    journal.seek(0, os.SEEK_END)
+    journal.write((json.dumps(record) + "\n").encode("utf-8"))
+    journal.flush()
+    os.fsync(journal.fileno())
+
+
+def write_batch_report(rows: list[dict]) -> None:
+    counts = {state: sum(r["status"] == state for r in rows) for state in ("created", "unchanged", "stop")}
+    lines = [
+        "## Batch Packaging",
+        f"Features: {len(rows)} (created {counts['created']}, unchanged {counts['unchanged']}, stop {counts['stop']})",
+        "",
+        "Feature | Status | Bundle | Stop reason",
+        "--- | --- | --- | ---",
+    ]
+    lines += [f"{r['feature_id']} | {r['status']} | {r['bundle'] or '-'} | {r['stop_reason'] or '-'}" for r in rows]
+    atomic_write(BATCH_REPORT, "\n".join(lines) + "\n")
+    atomic_write(BATCH_JSON, json.dumps(rows, indent=2) + "\n")
+
+
+def run_batch(ns: argparse.Namespace) -> int:
+    """Package many features; returns 1 when any of them stopped.
+
+    Unchanged features are answered from their existing bundles, the
+    validator runs once for the rest, and their gates and bundles are built
+    across a process pool. Each finished feature is journaled, so a batch
+    that is interrupted and started again with the same arguments resumes
+    where it stopped.
+    """
+    feature_ids = batch_features(ns)
+    allow_tokens = ns.allow_tokens == "yes"
+    jobs = ns.jobs if ns.jobs > 0 else (os.cpu_count() or 1)
+    key = {"features": feature_ids, "allow_tokens": allow_tokens, "chunk_tokens": ns.chunk_tokens, "archive": ns.archive, "force": ns.force}
+    with locked(BATCH_JOURNAL) as journal:
+        done = resume_point(journal, key)
+        if done:
+            print(f"== Resuming batch: {len(done)} of {len(feature_ids)} features done ==", flush=True)
+        else:
+            print(f"== Batch: {len(feature_ids)} features ==", flush=True)
+
+        def finish(result: dict, built: bool) -> None:
+            result["status"] = "stop" if result["code"] else ("created" if built else "unchanged")
+            done[result["feature_id"]] = result
+            journal_append(journal, {"op": "feature", **result})
+            print(result["output"], end="", flush=True)
+
+        pending = []
+        for fid in feature_ids:
+            if fid in done:
+                continue
+            result = {"feature_id": fid, **captured(reuse_bundle, fid, allow_tokens, ns.chunk_tokens, ns.archive, ns.force)}
+            if result["code"] or result["bundle"]:
+                finish(result, built=False)
+            else:
+                pending.append(fid)
+
+        if pending:
+            # One validator run covers every feature without a fresh result
+            stale = [fid for fid in pending if feature_results.load_fresh(fid) is None]
+            if stale:
+                _ = run_validator(*stale)
+            if jobs > 1 and len(pending) > 1:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+                    futures = [pool.submit(batch_package, fid, allow_tokens, ns.chunk_tokens, ns.archive) for fid in pending]
+                    for future in as_completed(futures):
+                        finish(future.result(), built=True)
+            else:
+                for fid in pending:
+                    finish(batch_package(fid, allow_tokens, ns.chunk_tokens, ns.archive), built=True)
+        journal_append(journal, {"op": "end", "ended_utc": utc_iso()})
+
+    rows = [{k: done[fid][k] for k in ("feature_id", "status", "bundle", "stop_reason")} for fid in feature_ids]
+    write_batch_report(rows)
+    stopped = sum(r["status"] == "stop" for r in rows)
+    print("== Summary ==")
+    print(f"BATCH: {len(rows)} features, {sum(r['status'] == 'created' for r in rows)} created, "
+          f"{sum(r['status'] == 'unchanged' for r in rows)} unchanged, {stopped} stopped; "
+          f"see {BATCH_REPORT.relative_to(ROOT)}")
+    return 1 if stopped else 0
+
+
+def main():
+    ns = parse_args()
+    if ns.gc:
+        kept, removed, freed = BundleStore().gc(BUNDLE_ROOT, ns.dry_run)
+        verb = "would remove" if ns.dry_run else "removed"
+        print(f"GC: {verb} {removed} objects ({freed} bytes); kept {kept}")
+        return
+    if ns.archive == "tar.zst" and zstandard is None:
+        stop("zstd archives need the zstandard module", "pip install zstandard, or use --archive tar.gz", "")
+        raise SystemExit(2)
+    if ns.all or ns.features is not None:
+        raise SystemExit(run_batch(ns))
+    feature_id = ns.feature_id
+    allow_tokens = ns.allow_tokens == "yes"
+
+    # Unchanged inputs: hand back the bundle they already produced
+    if reuse_bundle(feature_id, allow_tokens, ns.chunk_tokens, ns.archive, ns.force) is not None:
+        return
 
-    # Optional: run validator for extra assurance
-    _ = run_validator(feature_id)
-    build_bundle(feature_id, ns.allow_tokens == "yes")
+    # Validate unless a result for the current files exists
+    if feature_results.load_fresh(feature_id) is None:
+        _ = run_validator(feature_id)
+    package(feature_id, allow_tokens, ns.chunk_tokens, ns.archive)
 
 
 if __name__ == "__main__":